@@ -1,3 +1,16 @@
+from array import array
+from math import gcd, lcm, isqrt
+import random
+
+from ..numbers import factors as fc
+
+try:
+	import numpy as np
+except ImportError:  # NumPy is optional and only speeds up ModArray
+	np = None
+
+
+
 class Modulo:
 	def __init__(self, residue, modulo):
 		self.residue = residue % modulo
@@ -9,7 +22,7 @@ class Modulo:
 	
 	def lift(self, other, operator):
 		res, mod = self.residue, self.modulo
-		if isinstance(other, Modulo):
+		if isinstance(other, (Modulo, ModElement)):
 			if other.modulo != mod:
 				raise ValueError("Modulo Objects must have same modulo to apply operations")
 			
@@ -86,25 +99,25 @@ class Modulo:
 			a, b = b % a, a
 		
 		if b > 1:
-			raise ZeroDivisionError(f'{self.residue} (mod {self.modulo}) is not a unit / invertible')
+			raise ZeroDivisionError(f'{r} (mod {m}) is not a unit / invertible')
 		else:
 			return x0
 	
 	def order(self):
-		a, b = self.residue % self.modulo, self.modulo
-		while a > 0:
-			a, b = b % a, a
-		
-		if b > 1:
+		""" Multiplicative order found by stripping prime factors from the Carmichael function, 0 for non-units """
+		m = self.modulo
+		a = self.residue % m
+		if gcd(a, m) != 1:
 			return 0
 		
-		power, count = self.residue % self.modulo, 1
-		while power != 1:
-			power *= self.residue
-			power %= self.modulo
-			count += 1
+		order, lamFacs = carmichael(m)
+		for q, k in lamFacs:
+			for _ in range(k):
+				if pow(a, order // q, m) != 1:
+					break
+				order //= q
 		
-		return count
+		return order
 	
 	
 	def __str__(self):
@@ -116,3 +129,657 @@ class Modulo:
 def mod(m):
 	return Modulo(1, m)
 
+
+
+# Carmichael function and its factorization per modulus, shared by order and primitive root searches
+_CARMICHAEL = {}
+
+def carmichael(m):
+	"""
+	Carmichael function λ(m), the exponent of the unit group mod `m`
+	
+	Returns:
+		(int, list) -- λ(m) and its factorization as [(prime, power)]
+	"""
+	
+	if m in _CARMICHAEL:
+		return _CARMICHAEL[m]
+	
+	lam, lamFacs = 1, {}
+	for p, k in fc.factors(m):
+		# λ(p^k) = p^(k-1) (p - 1) except λ(2^k) = 2^(k-2) for k >= 3
+		if p == 2:
+			pk = 2 ** (k - 2) if k >= 3 else 2 ** (k - 1)
+			parts = [(2, k - 2 if k >= 3 else k - 1)]
+		else:
+			pk = p ** (k - 1) * (p - 1)
+			parts = [(p, k - 1)] + fc.factors(p - 1)
+		
+		lam = lcm(lam, pk)
+		for q, e in parts:
+			if e > 0:
+				lamFacs[q] = max(lamFacs.get(q, 0), e)
+	
+	_CARMICHAEL[m] = res = (lam, sorted(lamFacs.items()))
+	return res
+
+def is_primitive_root(g, m):
+	""" Check whether `g` generates the whole unit group mod `m` """
+	g %= m
+	if m == 1:
+		return True
+	elif gcd(g, m) != 1:
+		return False
+	
+	lam, lamFacs = carmichael(m)
+	if lam != fc.eulertotient(m):
+		return False  # Unit group is not cyclic
+	return all(pow(g, lam // q, m) != 1 for q, _ in lamFacs)
+
+def primitive_root(m):
+	"""
+	Smallest primitive root mod `m`
+	
+	Raises:
+		ValueError -- if the unit group mod `m` is not cyclic (m not 1, 2, 4, p^k or 2p^k)
+	"""
+	
+	if m < 1:
+		raise ValueError(f"Modulus must be positive not {m}")
+	elif m <= 2:
+		return m - 1
+	
+	lam, lamFacs = carmichael(m)
+	if lam != fc.eulertotient(m):
+		raise ValueError(f"No primitive root exists mod {m}")
+	
+	for g in range(2, m):
+		if gcd(g, m) == 1 and all(pow(g, lam // q, m) != 1 for q, _ in lamFacs):
+			return g
+
+
+
+class ModRing:
+	"""
+	Arithmetic modulo a fixed `modulus` on raw ints with precomputed constants
+	for Barrett reduction and (for odd moduli) Montgomery multiplication.
+	Calling the ring builds slotted `ModElement`s bound to it.
+	
+	`mul` and `pow` use CPython's `%` and `pow` which already run in C, while
+	`barrett`, `tomont`, `montmul` and `redc` expose the division free reductions
+	for fixed width kernels that keep values in those representations.
+	"""
+	
+	__slots__ = ('modulus', 'bits', 'barrettFactor', 'montMask', 'montInv', 'montR2')
+	
+	def __init__(self, modulus):
+		if modulus <= 1:
+			raise ValueError(f"Modulus must be greater than 1 not {modulus}")
+		
+		self.modulus = m = modulus
+		self.bits = k = m.bit_length()
+		
+		# Barrett: floor(x / m) ~ (x * floor(4^k / m)) >> 2k for 0 <= x < m^2
+		self.barrettFactor = (1 << (2 * k)) // m
+		
+		# Montgomery with R = 2^k requires gcd(m, R) = 1
+		if m & 1:
+			self.montMask = (1 << k) - 1
+			self.montInv = -pow(m, -1, 1 << k) & self.montMask
+			self.montR2 = (1 << (2 * k)) % m
+		else:
+			self.montMask = self.montInv = self.montR2 = None
+	
+	def __call__(self, residue):
+		return ModElement(residue % self.modulus, self)
+	
+	def __eq__(self, other):
+		return isinstance(other, ModRing) and self.modulus == other.modulus
+	
+	def __hash__(self):
+		return hash(('ModRing', self.modulus))
+	
+	def __repr__(self):
+		return f'ModRing({self.modulus})'
+	
+	
+	
+	def add(self, a, b):
+		""" Sum of two reduced residues """
+		s = a + b
+		return s - self.modulus if s >= self.modulus else s
+	
+	def sub(self, a, b):
+		""" Difference of two reduced residues """
+		d = a - b
+		return d + self.modulus if d < 0 else d
+	
+	def neg(self, a):
+		return self.modulus - a if a else 0
+	
+	def mul(self, a, b):
+		return a * b % self.modulus
+	
+	def pow(self, a, e):
+		return pow(a, e, self.modulus)
+	
+	def inv(self, a):
+		try:
+			return pow(a, -1, self.modulus)
+		except ValueError:
+			raise ZeroDivisionError(f'{a} (mod {self.modulus}) is not a unit / invertible')
+	
+	
+	
+	def barrett(self, x):
+		""" Reduce `0 <= x < modulus^2` without division """
+		m = self.modulus
+		r = x - ((x * self.barrettFactor) >> (2 * self.bits)) * m
+		while r >= m:
+			r -= m
+		return r
+	
+	def redc(self, t):
+		""" Montgomery reduction of `0 <= t < modulus * 2^bits` returning `t / 2^bits (mod modulus)` """
+		if self.montInv is None:
+			raise ValueError(f"Montgomery arithmetic requires an odd modulus not {self.modulus}")
+		
+		u = (t + (((t & self.montMask) * self.montInv) & self.montMask) * self.modulus) >> self.bits
+		return u - self.modulus if u >= self.modulus else u
+	
+	def tomont(self, a):
+		""" Convert a reduced residue into Montgomery form `a * 2^bits (mod modulus)` """
+		return self.redc(a * self.montR2)
+	
+	def frommont(self, a):
+		return self.redc(a)
+	
+	def montmul(self, a, b):
+		""" Product of two residues in Montgomery form, staying in Montgomery form """
+		return self.redc(a * b)
+
+class ModElement:
+	""" Residue bound to a `ModRing` with direct operators and no per operation lambdas """
+	
+	__slots__ = ('residue', 'ring')
+	
+	def __init__(self, residue, ring):
+		self.residue = residue  # Assumed reduced, use `ring(residue)` otherwise
+		self.ring = ring
+	
+	@property
+	def modulo(self):
+		return self.ring.modulus
+	
+	def _value(self, other):
+		""" Reduced residue of `other` checking that moduli match """
+		if type(other) is ModElement:
+			if other.ring is not self.ring and other.ring.modulus != self.ring.modulus:
+				raise ValueError("Modulo Objects must have same modulo to apply operations")
+			return other.residue
+		elif isinstance(other, Modulo):
+			if other.modulo != self.ring.modulus:
+				raise ValueError("Modulo Objects must have same modulo to apply operations")
+			return other.residue
+		return other % self.ring.modulus
+	
+	def __eq__(self, other):
+		""" Equal to elements of the same modulus with the same residue, or to the residue itself as an int """
+		if type(other) is ModElement:
+			return self.ring.modulus == other.ring.modulus and self.residue == other.residue
+		return isinstance(other, int) and self.residue == other
+	
+	def __hash__(self):
+		return hash(self.residue)  # Consistent with the int equal to the residue
+	
+	def __int__(self):
+		return self.residue
+	
+	def __neg__(self):
+		return ModElement(self.ring.modulus - self.residue if self.residue else 0, self.ring)
+	
+	
+	
+	def __add__(self, other):
+		s = self.residue + self._value(other)
+		m = self.ring.modulus
+		return ModElement(s - m if s >= m else s, self.ring)
+	
+	def __radd__(self, other):
+		return self.__add__(other)
+	
+	def __sub__(self, other):
+		d = self.residue - self._value(other)
+		return ModElement(d + self.ring.modulus if d < 0 else d, self.ring)
+	
+	def __rsub__(self, other):
+		d = self._value(other) - self.residue
+		return ModElement(d + self.ring.modulus if d < 0 else d, self.ring)
+	
+	def __mul__(self, other):
+		return ModElement(self.residue * self._value(other) % self.ring.modulus, self.ring)
+	
+	def __rmul__(self, other):
+		return self.__mul__(other)
+	
+	def __truediv__(self, other):
+		return ModElement(self.residue * self.ring.inv(self._value(other)) % self.ring.modulus, self.ring)
+	
+	def __rtruediv__(self, other):
+		return ModElement(self._value(other) * self.ring.inv(self.residue) % self.ring.modulus, self.ring)
+	
+	def __pow__(self, other):
+		return ModElement(pow(self.residue, other, self.ring.modulus) if other >= 0
+			else pow(self.ring.inv(self.residue), -other, self.ring.modulus), self.ring)
+	
+	def inverse(self):
+		return ModElement(self.ring.inv(self.residue), self.ring)
+	
+	
+	def __str__(self):
+		return f'{self.residue} (mod {self.ring.modulus})'
+	
+	def __repr__(self):
+		return f'ModElement({self.residue}, {self.ring.modulus})'
+
+
+
+
+def crt(residues, moduli):
+	"""
+	Solve the system `x = residues[i] (mod moduli[i])`, moduli need not be coprime
+	
+	Returns:
+		Modulo -- x modulo the lcm of the moduli
+	
+	Raises:
+		ValueError -- if the congruences are inconsistent
+	"""
+	
+	if len(residues) != len(moduli):
+		raise ValueError(f"Residue-Modulus count mismatch between {len(residues)} and {len(moduli)}")
+	
+	x, m = 0, 1
+	for r, n in zip(residues, moduli):
+		g = gcd(m, n)
+		if (r - x) % g:
+			raise ValueError(f"Congruences x = {x} (mod {m}) and x = {r} (mod {n}) are inconsistent")
+		
+		# x + m t = r (mod n)  =>  t = (r - x) / g * (m / g)^-1 (mod n / g)
+		ng = n // g
+		t = (r - x) // g * Modulo.invert(m // g, ng) % ng if ng > 1 else 0
+		x += m * t
+		m *= ng
+		x %= m
+	
+	return Modulo(x, m)
+
+class CRTBasis:
+	"""
+	Garner reconstruction for a fixed list of pairwise coprime `moduli`
+	The mixed radix inverses are computed once so each reconstruction
+	only costs O(k^2) small multiplications and one big int Horner pass.
+	"""
+	
+	def __init__(self, moduli):
+		self.moduli = tuple(moduli)
+		self.modulus = 1
+		# radix[i] -- products m_0 ... m_(j-1) mod m_i for j < i, inverses[i] -- (m_0 ... m_(i-1))^-1 mod m_i
+		self.radix, self.inverses = [], []
+		for i, m in enumerate(self.moduli):
+			if gcd(self.modulus, m) != 1:
+				raise ValueError(f"CRTBasis moduli must be pairwise coprime, {m} is not")
+			
+			prods, acc = [], 1
+			for n in self.moduli[:i]:
+				prods.append(acc)
+				acc = acc * n % m
+			
+			self.radix.append(prods)
+			self.inverses.append(Modulo.invert(acc, m) % m)
+			self.modulus *= m
+	
+	def __len__(self):
+		return len(self.moduli)
+	
+	def digits(self, residues):
+		""" Mixed radix digits v with x = v_0 + v_1 m_0 + v_2 m_0 m_1 + ... """
+		digits = []
+		for r, m, prods, inv in zip(residues, self.moduli, self.radix, self.inverses):
+			acc = 0
+			for v, pr in zip(digits, prods):
+				acc += v * pr
+			digits.append((r - acc) * inv % m)
+		return digits
+	
+	def reconstruct(self, residues, symmetric=False):
+		"""
+		Integer in [0, modulus) (or (-modulus/2, modulus/2] if `symmetric`)
+		congruent to `residues[i]` modulo each `moduli[i]`
+		"""
+		
+		if len(residues) != len(self.moduli):
+			raise ValueError(f"Residue-Modulus count mismatch between {len(residues)} and {len(self.moduli)}")
+		
+		x = 0
+		for v, m in zip(reversed(self.digits(residues)), reversed(self.moduli)):
+			x = x * m + v
+		
+		if symmetric and 2 * x > self.modulus:
+			x -= self.modulus
+		return x
+	
+	def reconstruct_many(self, residueLists, symmetric=False):
+		""" Reconstruct each list of residues, e.g. the columns of several modular images """
+		return [self.reconstruct(res, symmetric) for res in residueLists]
+	
+	def __repr__(self):
+		return f'CRTBasis({list(self.moduli)})'
+
+
+
+# Prime subgroup orders above this use Pollard rho instead of a sqrt(q) sized table
+BSGS_LIMIT = 1 << 36
+
+def _bsgs(g, h, n, m):
+	""" Smallest x in [0, n) with g^x = h (mod m) by baby-step giant-step, None if there is none """
+	step = isqrt(n - 1) + 1
+	table = {}
+	cur = 1
+	for j in range(step):
+		table.setdefault(cur, j)
+		cur = cur * g % m
+	
+	# Giant steps multiply by g^-step
+	giant = pow(Modulo.invert(g, m), step, m)
+	cur = h % m
+	for i in range(step):
+		j = table.get(cur)
+		if j is not None:
+			return i * step + j
+		cur = cur * giant % m
+	return None
+
+def _rho(g, h, q, m, attempts=16):
+	""" Discrete log of h to base g of prime order q by Pollard rho with Floyd cycle finding, None on failure """
+	def step(x, a, b):
+		s = x % 3
+		if s == 0:
+			return x * x % m, 2 * a % q, 2 * b % q
+		elif s == 1:
+			return x * g % m, (a + 1) % q, b
+		return x * h % m, a, (b + 1) % q
+	
+	for _ in range(attempts):
+		a0, b0 = random.randrange(q), random.randrange(q)
+		x = pow(g, a0, m) * pow(h, b0, m) % m
+		tort, hare = (x, a0, b0), (x, a0, b0)
+		while True:
+			tort = step(*tort)
+			hare = step(*step(*hare))
+			if tort[0] == hare[0]:
+				break
+		
+		# g^a1 h^b1 = g^a2 h^b2  =>  x (b1 - b2) = a2 - a1 (mod q)
+		db = (tort[2] - hare[2]) % q
+		if db:
+			x = (hare[1] - tort[1]) * Modulo.invert(db, q) % q
+			if pow(g, x, m) == h % m:
+				return x
+	return None
+
+def _primeLog(g, h, q, m):
+	""" Discrete log in the subgroup of prime order q generated by g """
+	if h % m == 1:
+		return 0
+	x = _bsgs(g, h, q, m) if q <= BSGS_LIMIT else _rho(g, h, q, m)
+	if x is None:
+		raise ValueError(f"{h} is not a power of {g} (mod {m})")
+	return x
+
+def _pohligHellman(a, b, m, n, nFacs):
+	""" Discrete log of b to base a of order n = prod q^e mod m reduced to prime order subgroups """
+	residues, moduli = [], []
+	for q, e in nFacs:
+		qe = q ** e
+		g = pow(a, n // qe, m)
+		h = pow(b, n // qe, m)
+		gamma = pow(g, qe // q, m)
+		gInv = Modulo.invert(g, m)
+		
+		# Solve for the base q digits of x mod q^e
+		x, qk = 0, 1
+		for k in range(e):
+			hk = pow(pow(gInv, x, m) * h % m, qe // (qk * q), m)
+			x += _primeLog(gamma, hk, q, m) * qk
+			qk *= q
+		
+		residues.append(x)
+		moduli.append(qe)
+	return crt(residues, moduli).residue
+
+def discrete_log(a, b, m):
+	"""
+	Smallest x >= 0 with `a^x = b (mod m)`
+	Common factors of `a` and `m` are stripped off first, then the problem in the unit group
+	is split by Pohlig-Hellman over the factorization of the order of `a` with each prime
+	order subproblem solved by baby-step giant-step or, for large primes, Pollard rho.
+	
+	Raises:
+		ValueError -- if no such x exists
+	"""
+	
+	a, b = a % m, b % m
+	if m == 1 or b == 1 % m:
+		return 0
+	
+	# a^k coef stays in the ideal generated by gcd(a, m), divide it out until a is a unit
+	offset, coef = 0, 1 % m
+	while (g := gcd(a, m)) != 1:
+		if b == coef:
+			return offset
+		elif b % g:
+			raise ValueError(f"{b} is not a power of {a} (mod {m})")
+		
+		b, m = b // g, m // g
+		coef = coef * (a // g) % m
+		a %= m
+		offset += 1
+	
+	b = b * Modulo.invert(coef, m) % m
+	if b == 1 % m:
+		return offset
+	
+	n = Modulo(a, m).order()
+	nFacs = []
+	rest = n
+	for q, _ in carmichael(m)[1]:
+		e = 0
+		while rest % q == 0:
+			rest //= q
+			e += 1
+		if e:
+			nFacs.append((q, e))
+	
+	if pow(b, n, m) != 1:
+		raise ValueError(f"{b} is not a power of {a} (mod {m})")
+	
+	x = _pohligHellman(a, b, m, n, nFacs)
+	if pow(a, x, m) != b:
+		raise ValueError(f"{b} is not a power of {a} (mod {m})")
+	return x + offset
+
+
+def _mulmodArray(a, b, m):
+	"""
+	Elementwise `a * b % m` for uint64 arrays of residues with `m < 2^63`
+	without overflowing 64 bits. `b` is consumed in chunks of `64 - bits(m)` bits
+	so every intermediate `r << k` and `a * chunk` stays below `m * 2^k <= 2^64`.
+	"""
+	
+	bits = m.bit_length()
+	if 2 * bits <= 64:
+		return a * b % np.uint64(m)
+	
+	k = 64 - bits
+	mask, mod = np.uint64((1 << k) - 1), np.uint64(m)
+	r = np.zeros(np.broadcast(a, b).shape, dtype=np.uint64)
+	for shift in range((bits - 1) // k * k, -1, -k):
+		r = (r << np.uint64(k)) % mod
+		r += a * ((b >> np.uint64(shift)) & mask) % mod
+		r -= np.where(r >= mod, mod, np.uint64(0))
+	return r
+
+class ModArray:
+	"""
+	Array of residues modulo `modulus < 2^63` stored in a NumPy uint64 buffer
+	(or `array('Q')` without NumPy) with elementwise arithmetic
+	"""
+	
+	def __init__(self, values, modulus):
+		if not 1 < modulus < 1 << 63:
+			raise ValueError(f"ModArray requires 1 < modulus < 2^63 not {modulus}")
+		
+		self.modulus = modulus
+		vals = [int(x) % modulus for x in values]
+		self.data = np.array(vals, dtype=np.uint64) if np is not None else array('Q', vals)
+	
+	@staticmethod
+	def _wrap(data, modulus):
+		arr = ModArray.__new__(ModArray)
+		arr.modulus, arr.data = modulus, data
+		return arr
+	
+	def _operand(self, other):
+		""" Buffer or reduced scalar for `other` checking that moduli match """
+		if isinstance(other, ModArray):
+			if other.modulus != self.modulus:
+				raise ValueError("Modulo Objects must have same modulo to apply operations")
+			elif len(other) != len(self):
+				raise ValueError(f"ModArray length mismatch between {len(self)} and {len(other)}")
+			return other.data
+		elif isinstance(other, (Modulo, ModElement)):
+			if other.modulo != self.modulus:
+				raise ValueError("Modulo Objects must have same modulo to apply operations")
+			other = other.residue
+		return int(other) % self.modulus
+	
+	def __len__(self):
+		return len(self.data)
+	
+	def __iter__(self):
+		return (Modulo(x, self.modulus) for x in self.tolist())
+	
+	def __getitem__(self, key):
+		if isinstance(key, slice):
+			return ModArray._wrap(self.data[key], self.modulus)
+		return Modulo(int(self.data[key]), self.modulus)
+	
+	def tolist(self):
+		""" Residues as a list of ints """
+		return self.data.tolist()
+	
+	
+	
+	def __add__(self, other):
+		b, m = self._operand(other), self.modulus
+		if np is not None:
+			# Residues are below 2^63 so the sum cannot wrap
+			s = self.data + np.uint64(b) if isinstance(b, int) else self.data + b
+			return ModArray._wrap(s - np.where(s >= np.uint64(m), np.uint64(m), np.uint64(0)), m)
+		
+		b = [b] * len(self) if isinstance(b, int) else b
+		return ModArray._wrap(array('Q', (x - m if x >= m else x for x in map(int.__add__, self.data, b))), m)
+	
+	def __radd__(self, other):
+		return self.__add__(other)
+	
+	def __neg__(self):
+		m = self.modulus
+		if np is not None:
+			return ModArray._wrap(np.where(self.data == 0, self.data, np.uint64(m) - self.data), m)
+		return ModArray._wrap(array('Q', (m - x if x else 0 for x in self.data)), m)
+	
+	def __sub__(self, other):
+		b, m = self._operand(other), self.modulus
+		if isinstance(b, int):
+			return self.__add__(m - b if b else 0)
+		
+		if np is not None:
+			return ModArray._wrap(self.data - b + np.where(self.data < b, np.uint64(m), np.uint64(0)), m)
+		return ModArray._wrap(array('Q', (x - y if x >= y else x - y + m for x, y in zip(self.data, b))), m)
+	
+	def __rsub__(self, other):
+		return (-self).__add__(other)
+	
+	def __mul__(self, other):
+		b, m = self._operand(other), self.modulus
+		if np is not None:
+			return ModArray._wrap(_mulmodArray(self.data, np.uint64(b) if isinstance(b, int) else b, m), m)
+		
+		if isinstance(b, int):
+			return ModArray._wrap(array('Q', (x * b % m for x in self.data)), m)
+		return ModArray._wrap(array('Q', (x * y % m for x, y in zip(self.data, b))), m)
+	
+	def __rmul__(self, other):
+		return self.__mul__(other)
+	
+	
+	
+	def sum(self):
+		return Modulo(sum(self.tolist()), self.modulus)
+	
+	def dot(self, other):
+		""" Dot product of two ModArrays as a Modulo """
+		b, m = self._operand(other), self.modulus
+		if isinstance(b, int):
+			raise TypeError("ModArray dot product requires another ModArray")
+		elif np is not None:
+			return (self * other).sum()
+		
+		# Python ints do not overflow so reduce once at the end
+		return Modulo(sum(map(int.__mul__, self.data, b)), m)
+	
+	def prefix(self):
+		""" Prefix products `[a0, a0*a1, a0*a1*a2, ...]` """
+		m, acc = self.modulus, 1
+		out = []
+		for x in self.tolist():
+			acc = acc * x % m
+			out.append(acc)
+		return ModArray._wrap(np.array(out, dtype=np.uint64) if np is not None else array('Q', out), m)
+	
+	def inverse(self):
+		"""
+		Elementwise inverses by Montgomery's trick: one modular inversion
+		of the total product plus 3n multiplications
+		
+		Raises:
+			ZeroDivisionError -- if any entry is not a unit
+		"""
+		
+		m, vals = self.modulus, self.tolist()
+		if not vals:
+			return ModArray._wrap(self.data[:0], m)
+		
+		prefix = self.prefix().tolist()
+		try:
+			inv = Modulo.invert(prefix[-1], m)
+		except ZeroDivisionError:
+			bad = next(x for x in vals if gcd(x, m) != 1)
+			raise ZeroDivisionError(f'{bad} (mod {m}) is not a unit / invertible') from None
+		
+		out = [0] * len(vals)
+		for i in range(len(vals) - 1, 0, -1):
+			out[i] = inv * prefix[i - 1] % m
+			inv = inv * vals[i] % m
+		out[0] = inv % m
+		return ModArray._wrap(np.array(out, dtype=np.uint64) if np is not None else array('Q', out), m)
+	
+	
+	def __str__(self):
+		return f'{self.tolist()} (mod {self.modulus})'
+	
+	def __repr__(self):
+		return f'ModArray({self.tolist()}, {self.modulus})'
+
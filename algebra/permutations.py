@@ -1,139 +1,232 @@
+from array import array
 import collections
 
+def _istable(elements):
+	""" Whether the elements can index an image table """
+	return all(type(x) is int and x >= 0 for x in elements)
+
+def _ordered(elements):
+	""" Elements in their natural order, or by type and repr when they cannot be compared """
+	try:
+		return sorted(elements)
+	except TypeError:
+		return sorted(elements, key=lambda x: (type(x).__name__, repr(x)))
+
 class Permutation:
+	"""
+	Permutation moving finitely many hashable elements
+	Permutations of the non-negative integers are stored in one-line notation as an
+	`array('I')` image table of the integers below the largest moved element, so
+	application is O(1) while composition and inversion are O(n). Any other elements
+	are kept in a dict from each moved element to its image. The disjoint cycles are
+	only worked out when they are needed.
+	"""
+	
 	def __init__(self, *cycles):
 		try:  # Test to see if elements of cycles are iterables
-			self.cycles = tuple(map(tuple, cycles))
+			cycles = tuple(map(tuple, cycles))
 		except TypeError:
-			self.cycles = (cycles,)
+			cycles = (cycles,)
+		
+		for cyc in cycles:
+			if len(set(cyc)) != len(cyc):
+				x = collections.Counter(cyc).most_common(1)[0][0]
+				raise ValueError(f"Cycle ({'  '.join(map(str, cyc))}) has duplicate value {x}")
+		
+		# The product applies the rightmost cycle first, fold the cycles in from the left
+		# so each one only touches its own elements
+		if _istable(x for cyc in cycles for x in cyc):
+			images = array('I', range(max((x + 1 for cyc in cycles for x in cyc), default=0)))
+			get = images.__getitem__
+		else:
+			images = {}
+			get = lambda x: images.get(x, x)
 		
-		self._disjointify()
+		for cyc in cycles:
+			if len(cyc) < 2:
+				continue
+			
+			heads = [get(x) for x in cyc[1:]] + [get(cyc[0])]
+			for x, y in zip(cyc, heads):
+				images[x] = y
+		
+		if isinstance(images, dict):
+			self._setmap(images)
+		else:
+			self._setimages(images)
 	
-	def _disjointify(self):
-		""" Make cycles disjoint """
-		moved = []
-		isdisjoint = True
-		for cyc in self.cycles:
-			fromcyc = []
-			for x in cyc:
-				if x not in moved:
-					moved.append(x)
-				else:
-					isdisjoint = False
-				
-				if x in fromcyc:
-					raise ValueError(f"Cycle ({'  '.join(map(str, cyc))}) has duplicate value {x}")
-				fromcyc.append(x)
+	def _setimages(self, images):
+		size = len(images)
+		while size > 0 and images[size - 1] == size - 1:
+			size -= 1
 		
-		if isdisjoint:
-			# Clean fixed cycles out
-			self.cycles = tuple(filter(lambda cyc: len(cyc) > 1, self.cycles))
+		self._images = images[:size] if size < len(images) else images
+		self._map = None
+		self._cycles = None
+	
+	def _setmap(self, mapping):
+		mapping = {x: y for x, y in mapping.items() if x != y}
+		if _istable(mapping):
+			images = array('I', range(max(mapping, default=-1) + 1))
+			for x, y in mapping.items():
+				images[x] = y
+			self._setimages(images)
 			return
 		
-		newcycles = []
-		while len(moved) > 0:
-			head = moved[0]
-			newcyc = [head]
-			del moved[0]
+		self._images = None
+		self._map = mapping
+		self._cycles = None
+	
+	@staticmethod
+	def _fromtable(images):
+		perm = Permutation.__new__(Permutation)
+		perm._setimages(images)
+		return perm
+	
+	@staticmethod
+	def _fromdict(mapping):
+		perm = Permutation.__new__(Permutation)
+		perm._setmap(mapping)
+		return perm
+	
+	def _mapping(self):
+		""" Dict from each moved element to its image """
+		if self._map is not None:
+			return self._map
+		return {x: y for x, y in enumerate(self._images) if x != y}
+	
+	@property
+	def cycles(self):
+		"""
+		Canonical cycle form, the disjoint cycles of length at least 2 each starting
+		at its smallest element and sorted by those elements
+		"""
+		if self._cycles is None:
+			if self._map is None:
+				images, heads = self._images, range(len(self._images))
+				seen = bytearray(len(images))
+			else:
+				images, heads = self._map, _ordered(self._map)
+				seen = dict.fromkeys(images, 0)
 			
-			curr = self(head, assumeDisjoint=False)
-			while curr != head:
-				newcyc.append(curr)
-				moved.remove(curr)
-				curr = self(curr, assumeDisjoint=False)
+			cycles = []
+			for head in heads:
+				if seen[head] or images[head] == head:
+					continue
+				
+				cyc = [head]
+				seen[head] = 1
+				curr = images[head]
+				while curr != head:
+					cyc.append(curr)
+					seen[curr] = 1
+					curr = images[curr]
+				cycles.append(tuple(cyc))
 			
-			if len(newcyc) > 1:
-				newcycles.append(newcyc)
-		
-		self.cycles = newcycles
+			self._cycles = tuple(cycles)
+		return self._cycles
 	
 	def moved(self):
-		moved = []
-		for cyc in self.cycles:
-			for x in cyc:
-				if x not in moved:
-					moved.append(x)
-					yield x
+		if self._map is not None:
+			yield from _ordered(self._map)
+			return
+		
+		for x, y in enumerate(self._images):
+			if x != y:
+				yield x
+	
+	def images(self, size=None):
+		""" List of the images of range(size) (default up to the largest moved element) """
+		if self._map is not None:
+			raise TypeError("Only Permutations of the non-negative integers have an image table")
+		
+		if size is None:
+			size = len(self._images)
+		elif size < len(self._images):
+			raise ValueError(f"Permutation moves {len(self._images) - 1} which is outside of range({size})")
+		
+		return self._images.tolist() + list(range(len(self._images), size))
 	
 	
 	@staticmethod
 	def fromfunc(func, domain):
-		domain = [d for d in domain]
-		used = []  # Elements that have already been assigned to a cycle
+		images = {x: func(x) for x in domain}
+		if len(set(images.values())) != len(images) or any(y not in images for y in images.values()):
+			raise TypeError("Given function does not form a bijection on domain")
 		
-		cycles = []
-		while len(domain) > 0:
-			head = domain[0]
-			cyc = [head]
-			
-			# Move head to used set
-			used.append(domain[0])
-			del domain[0]
-			
-			curr = func(head)
-			while curr != head:
-				if curr in used or curr not in domain:
-					raise TypeError("Given function does not form a bijection on domain")
-				
-				cyc.append(curr)
-				used.append(curr)
-				domain.remove(curr)
-				curr = func(curr)
-			
-			if len(cyc) > 1:
-				cycles.append(cyc)
+		return Permutation._fromdict(images)
+	
+	@staticmethod
+	def fromimages(images):
+		""" Permutation of range(len(images)) sending each i to images[i] """
+		n = len(images)
+		seen = bytearray(n)
+		for y in images:
+			if not 0 <= y < n or seen[y]:
+				raise TypeError("Given images do not form a bijection on domain")
+			seen[y] = 1
 		
-		return Permutation(*cycles)
+		return Permutation._fromtable(array('I', images))
 	
 	
 	def __eq__(self, other):
 		if other == 1:
-			return len(self.cycles) == 0
+			return self._map is None and len(self._images) == 0
 		
 		if not isinstance(other, Permutation):
 			return False
 		
-		othercycs = list(other.cycles)
-		for cyc in self.cycles:
-			found, x = False, cyc[0]
-			for ocyc in othercycs:
-				if x in ocyc:
-					i = ocyc.index(x)
-					if cyc != ocyc[i:] + ocyc[:i]: # Rotate and compare cycles
-						return False
-					else:
-						othercycs.remove(ocyc)
-						found = True
-						break
-			
-			if not found:
-				return False
-		
-		return len(othercycs) == 0
+		if self._map is None and other._map is None:
+			return self._images == other._images
+		return self._mapping() == other._mapping()
 	
 	def __neq__(self, other):
 		return not self.__eq__(other)
 	
+	def __hash__(self):
+		if self == 1:
+			return hash(1)  # The identity compares equal to 1
+		return hash(self.cycles)
+	
+	
+	
+	def _compose(self, other):
+		""" Permutation applying `other` then `self` """
+		if self._map is not None or other._map is not None:
+			a, b = self._mapping(), other._mapping()
+			return Permutation._fromdict({x: a.get(b.get(x, x), b.get(x, x)) for x in a.keys() | b.keys()})
+		
+		a, b = self._images, other._images
+		size = max(len(a), len(b))
+		if len(a) < size:
+			a = a + array('I', range(len(a), size))
+		if len(b) < size:
+			b = b + array('I', range(len(b), size))
+		return Permutation._fromtable(array('I', map(a.__getitem__, b)))
 	
+	def _copy(self):
+		if self._map is not None:
+			return Permutation._fromdict(self._map)
+		return Permutation._fromtable(self._images)
 	
 	def __mul__(self, other):
 		if other == 1:
-			return Permutation(*self.cycles)
+			return self._copy()
 		
 		if not isinstance(other, Permutation):
 			raise TypeError("Permutation can only be multiplied by another Permutation")
 		
-		return Permutation(*self.cycles, *other.cycles)
+		return self._compose(other)
 	
 	def __rmul__(self, other):
 		if other == 1:
-			return Permutation(*self.cycles)
+			return self._copy()
 		
 		return other.__mul__(self)
 	
 	def __div__(self, other):
 		if other == 1:
-			return Permutation(*self.cycles)
+			return self._copy()
 		
 		return self.__mul__(other.inverse())
 	
@@ -142,7 +235,7 @@ class Permutation:
 	
 	def __truediv__(self, other):
 		if other == 1:
-			return Permutation(*self.cycles)
+			return self._copy()
 		
 		return self.__mul__(other.inverse())
 	
@@ -150,21 +243,17 @@ class Permutation:
 		return self.inverse().__mul__(other)
 	
 	def __pow__(self, other):
-		if other < 0:
-			other = -other
-			step = self.inverse()
-		elif other > 0:
-			step = self
-		else:
-			return Permutation()
+		""" Power by rotating every cycle `other` places, O(n) for any exponent """
+		images = array('I', range(len(self._images))) if self._map is None else {}
+		for cyc in self.cycles:
+			shift = other % len(cyc)
+			if shift:
+				for x, y in zip(cyc, cyc[shift:] + cyc[:shift]):
+					images[x] = y
 		
-		accum = Permutation()
-		for i in range(other.bit_length() - 1, -1, -1):
-			accum *= accum
-			
-			if (other >> i) & 1:
-				accum *= step
-		return accum
+		if self._map is not None:
+			return Permutation._fromdict(images)
+		return Permutation._fromtable(images)
 	
 	def __rpow__(self, other):
 		return other.__pow__(self)
@@ -191,19 +280,21 @@ class Permutation:
 		return order
 	
 	def inverse(self):
-		return Permutation(*map(reversed, self.cycles))
+		if self._map is not None:
+			return Permutation._fromdict({y: x for x, y in self._map.items()})
+		
+		images = self._images
+		inv = array('I', images)
+		for x, y in enumerate(images):
+			inv[y] = x
+		return Permutation._fromtable(inv)
 	
-	def __call__(self, value, assumeDisjoint=True):
-		for cyc in reversed(self.cycles):
-			try:
-				i = cyc.index(value)
-				value = cyc[(i + 1) % len(cyc)]
-				
-				if assumeDisjoint:
-					break
-			except ValueError:
-				pass
+	def __call__(self, value):
+		if self._map is not None:
+			return self._map.get(value, value)
 		
+		if type(value) is int and 0 <= value < len(self._images):
+			return self._images[value]
 		return value
 	
 	
@@ -213,5 +304,5 @@ class Permutation:
 		return ' '.join(cycstrs)
 	
 	def __repr__(self):
-		cycstrs = ['(' + ', '.join(map(str, cyc)) + ')' for cyc in self.cycles]
+		cycstrs = ['(' + ', '.join(map(repr, cyc)) + ')' for cyc in self.cycles]
 		return f"Permutation({', '.join(cycstrs)})"
@@ -1,33 +1,104 @@
+from array import array
+from heapq import heapify, heappop, heappush
+from itertools import chain
+import random
+
 from . import modulo
+from ..numbers import primes
+
+try:
+	import numpy as np
+except ImportError:  # NumPy is optional and only speeds up the transforms
+	np = None
+
+# Polynomials of higher degree than this with at most SPARSE_DENSITY of their terms nonzero
+# are stored as a dict of exponents, others densely (internally in an `array('Q')` when `modulo`
+# fits a word, `coefficients` always returns a tuple)
+SPARSE_MIN_DEGREE = 64
+SPARSE_DENSITY = 0.125
+
+def _pack(cfs, mod):
+	if mod is not None and mod <= 1 << 64 and all(type(c) is int for c in cfs):
+		return array('Q', cfs)
+	return tuple(cfs)
 
 class Polynomial:
 	def __init__(self, *coefs, modulo=None):
-		self.coefficients = tuple(coefs)
-		
 		self.modulo = modulo
-		self._modCoefs()
+		self.coefficients = coefs
+		self._divisors = {}
+	
+	@property
+	def coefficients(self):
+		""" Tuple of dense coefficients from the constant term up, expanded on access for sparse polynomials """
+		if self._terms is None:
+			return tuple(self._coefs)
+		
+		cfs = [0] * (max(self._terms) + 1)
+		for e, c in self._terms.items():
+			cfs[e] = c
+		return tuple(cfs)
+	
+	@coefficients.setter
+	def coefficients(self, coefs):
+		""" Store reduced coefficients without trailing zeros in the representation matching their density """
+		cfs = [c % self.modulo for c in coefs] if self.modulo is not None else list(coefs)
+		while cfs and cfs[-1] == 0:
+			cfs.pop()
+		
+		self._terms, self._coefs = None, None
+		if len(cfs) > SPARSE_MIN_DEGREE and sum(1 for c in cfs if c != 0) <= SPARSE_DENSITY * len(cfs):
+			self._terms = {e: c for e, c in enumerate(cfs) if c != 0}
+		else:
+			self._coefs = _pack(cfs, self.modulo)
+	
+	@property
+	def terms(self):
+		""" Nonzero coefficients as a dict of {power: coefficient} """
+		if self._terms is not None:
+			return self._terms
+		return {e: c for e, c in enumerate(self._coefs) if c != 0}
+	
+	@property
+	def issparse(self):
+		return self._terms is not None
+	
+	@staticmethod
+	def fromterms(terms, modulo=None):
+		""" Polynomial from a dict of {power: coefficient} without expanding sparse ones """
+		poly = Polynomial(modulo=modulo)
+		terms = {e: c % modulo if modulo is not None else c for e, c in terms.items()}
+		terms = {e: c for e, c in terms.items() if c != 0}
 		
-		self.__trimmed = False
+		size = max(terms) + 1 if terms else 0
+		if size > SPARSE_MIN_DEGREE and len(terms) <= SPARSE_DENSITY * size:
+			poly._terms = terms
+		else:
+			cfs = [0] * size
+			for e, c in terms.items():
+				cfs[e] = c
+			poly._coefs = _pack(cfs, modulo)
+		return poly
 	
 	def __eq__(self, other):
-		self._trimzeros()
 		if isinstance(other, Polynomial):
-			other._trimzeros()
 			if len(other) != len(self) or other.modulo != self.modulo:
 				return False
+			elif self._terms is not None or other._terms is not None:
+				return self.terms == other.terms
 			
 			for i in range(len(self)):
-				if self.coefficients[i] != other.coefficients[i]:
+				if self._coefs[i] != other._coefs[i]:
 					return False
 			return True
 		else:
-			if len(self.coefficients) > 1 or self.modulo is not None:
+			if len(self) > 1 or self.modulo is not None:
 				return False
 			else:
-				if len(self.coefficients) == 0:
+				if len(self) == 0:
 					return other == 0
 				else:
-					return other == self.coefficients[0]
+					return other == self[0]
 	
 	def __neq__(self, other):
 		return not self.__eq__(other)
@@ -35,7 +106,9 @@ class Polynomial:
 	
 	
 	def copy(self):
-		return Polynomial(*self.coefficients, modulo=self.modulo)
+		poly = Polynomial(modulo=self.modulo)
+		poly._coefs, poly._terms = self._coefs, None if self._terms is None else dict(self._terms)
+		return poly
 	
 	@staticmethod
 	def variable(mod=None):
@@ -55,16 +128,8 @@ class Polynomial:
 		return Polynomial(*cfs, modulo=mod)
 	
 	def _trimzeros(self):
-		if self.coefficients == []:
-			return
-		
-		self._modCoefs()
-		
-		i = len(self.coefficients) - 1
-		while i >= 0 and self.coefficients[i] == 0:
-			i -= 1
-		self.coefficients = tuple(list(self.coefficients)[:i + 1])  # Exclude leading zeros
-		self.__trimmed = True
+		""" Coefficients are stored trimmed, nothing to do """
+		return
 	
 	def _findMod(self, other):
 		if isinstance(other, Polynomial) and other.modulo is not None:
@@ -80,14 +145,14 @@ class Polynomial:
 	
 	def _modCoefs(self):
 		if self.modulo is not None:
-			self.coefficients = tuple(map(lambda x: x % self.modulo, self.coefficients))
+			self.coefficients = self.coefficients
 	
 	
 	
 	def __len__(self):
-		if not self.__trimmed:
-			self._trimzeros()
-		return len(self.coefficients)
+		if self._terms is not None:
+			return max(self._terms) + 1
+		return len(self._coefs)
 	
 	@property
 	def degree(self):
@@ -95,41 +160,50 @@ class Polynomial:
 	
 	@property
 	def leading(self):
-		self._trimzeros()
-		return self.coefficients[-1]
+		if self._terms is not None:
+			return self._terms[max(self._terms)]
+		return self._coefs[-1]
 	
 	def __getitem__(self, power):
-		self._trimzeros()
-		if power < 0 or len(self) <= power:
+		if self._terms is not None:
+			return self._terms.get(power, 0)
+		elif power < 0 or len(self) <= power:
 			return 0
 		else:
-			return self.coefficients[power]
+			return self._coefs[power]
 	
 	
 	
 	def __int__(self):
-		return int(self.coefficients[0]) if len(self.coefficients) > 0 else 0
+		return int(self[0])
 	
 	def __float__(self):
-		return float(self.coefficients[0]) if len(self.coefficients) > 0 else 0
+		return float(self[0])
 	
 	
 	
 	def __neg__(self):
+		if self._terms is not None:
+			return Polynomial.fromterms({e: -c for e, c in self._terms.items()}, modulo=self.modulo)
 		return Polynomial(*[-c for c in self.coefficients], modulo=self.modulo)
 	
 	
 	
 	def __add__(self, other):
-		self._trimzeros()
+		if self._terms is not None or isinstance(other, Polynomial) and other._terms is not None:
+			terms = dict(self.terms)
+			for e, c in (other.terms.items() if isinstance(other, Polynomial) else [(0, other)]):
+				terms[e] = terms.get(e, 0) + c
+			return Polynomial.fromterms(terms, modulo=self._findMod(other))
+		
 		ncfs = [c for c in self.coefficients]
 		
 		if isinstance(other, Polynomial):
 			for i in range(len(other)):
 				if i < len(ncfs):
-					ncfs[i] += other.coefficients[i]
+					ncfs[i] += other._coefs[i]
 				else:
-			 		ncfs.append(other.coefficients[i])
+			 		ncfs.append(other._coefs[i])
 		else:
 			if len(ncfs) == 0:
 				ncfs.append(other)
@@ -143,7 +217,9 @@ class Polynomial:
 	
 	def __sub__(self, other):
 		if isinstance(other, Polynomial):
-			return other.__neg__().__add__(self)
+			return (-other).__add__(self)
+		elif self._terms is not None:
+			return Polynomial.__add__(self, -other)
 		else:
 			ncfs = [c for c in self.coefficients]
 			if len(ncfs) == 0:
@@ -158,18 +234,23 @@ class Polynomial:
 	
 	
 	def __mul__(self, other):
-		self._trimzeros()
-		
-		if isinstance(other, Polynomial):
-			ncfs = [0] * (self.degree + other.degree + 1)
-			
-			for i in range(len(self)):
-				for j in range(len(other)):
-					ncfs[i + j] += self.coefficients[i] * other.coefficients[j]
-		else:
+		mod = self._findMod(other)
+		if not isinstance(other, Polynomial):
+			if self._terms is not None:
+				return Polynomial.fromterms({e: c * other for e, c in self._terms.items()}, modulo=mod)
 			ncfs = [c * other for c in self.coefficients]
+		elif (self._terms is not None or other._terms is not None) and \
+			len(self.terms) * len(other.terms) <= len(self) + len(other):
+			# Term by term product is cheaper than a dense product of the expanded polynomials
+			terms = {}
+			for e1, c1 in self.terms.items():
+				for e2, c2 in other.terms.items():
+					terms[e1 + e2] = terms.get(e1 + e2, 0) + c1 * c2
+			return Polynomial.fromterms(terms, modulo=mod)
+		else:
+			ncfs = multiply(self.coefficients, other.coefficients, mod)
 		
-		return Polynomial(*ncfs, modulo=self._findMod(other))
+		return Polynomial(*ncfs, modulo=mod)
 	
 	def __rmul__(self, other):
 		return self.__mul__(other)
@@ -178,17 +259,12 @@ class Polynomial:
 	
 	def __pow__(self, other):
 		assert type(other) == int, "Polynomial can only be brought to an integer power"
-		prod = None
-		while other > 0:
-			if prod is None:
-				prod = self.copy()
-			else:
-				prod *= self
-			
-			other -= 1
-		
-		if prod is None:
-			prod = Polynomial(1, modulo=self.modulo)
+		# Square and multiply from the most significant bit
+		prod = Polynomial(1, modulo=self.modulo)
+		for bit in bin(other)[2:] if other > 0 else '':
+			prod = prod * prod
+			if bit == '1':
+				prod = prod * self
 		
 		return prod
 	
@@ -196,37 +272,42 @@ class Polynomial:
 	
 	@staticmethod
 	def divmod(a, b):
-		a._trimzeros()
-		b._trimzeros()
 		mod = Polynomial._findMod(a, b)
 		
-		if a.degree < b.degree:
-			return (Polynomial(modulo=mod), a.copy())
-		elif len(b.coefficients) == 0:
+		if len(b) == 0:
 			raise ZeroDivisionError('Polynomial divided by zero')
+		elif a.degree < b.degree:
+			return (Polynomial(modulo=mod), Polynomial.fromterms(a.terms, modulo=mod))
+		elif b._terms is not None:
+			return _sparseDivmod(a, b, mod)
+		elif mod is not None and min(b.degree, a.degree - b.degree + 1) >= DIVISION_THRESHOLD:
+			# Only over Z/m, the inverse series amplifies float rounding and grows integer coefficients
+			return b.divisor(mod).divmod(a)
 		else:
-			qcfs, rcfs = [], [c for c in a.coefficients]
 			divcf = b.leading
-			if mod is None:
-				invDivcf = 1 / divcf
-			else:
-				invDivcf = modulo.Modulo.invert(divcf, mod)
-			
+			invDivcf = _inverse(divcf, mod)
 			divis = [c * invDivcf for c in b.coefficients]
 			
-			diff = len(rcfs) - len(divis)
-			while diff >= 0:
-				lead = rcfs[-1]
+			# Eliminate the leading term in place from the top down
+			n = b.degree
+			rcfs = list(a.coefficients)
+			qcfs = [0] * (len(rcfs) - n)
+			for diff in range(len(qcfs) - 1, -1, -1):
+				lead = rcfs[diff + n] if mod is None else rcfs[diff + n] % mod
 				if lead != 0:
-					for i in range(len(rcfs)):
-						if i - diff >= 0:
-							rcfs[i] -= lead * divis[i - diff]
+					for i in range(n):
+						rcfs[diff + i] -= lead * divis[i]
 				
-				rcfs = rcfs[:-1]
-				qcfs.insert(0, lead * invDivcf)
-				diff -= 1
+				qcfs[diff] = lead * invDivcf
 			
-			return (Polynomial(*qcfs, modulo=mod), Polynomial(*rcfs, modulo=mod))
+			return (Polynomial(*qcfs, modulo=mod), Polynomial(*rcfs[:n], modulo=mod))
+	
+	def divisor(self, mod=None):
+		""" Cached `Divisor` for repeated division by this polynomial (over `mod` if given) """
+		mod = self.modulo if mod is None else mod
+		if mod not in self._divisors:
+			self._divisors[mod] = Divisor(self, mod)
+		return self._divisors[mod]
 	
 	def __floordiv__(self, other):
 		if not isinstance(other, Polynomial):
@@ -249,23 +330,109 @@ class Polynomial:
 	
 	
 	def __call__(self, x):
+		if self._terms is not None:
+			if self.modulo is not None and type(x) is int:
+				return sum(c * pow(x, e, self.modulo) for e, c in self._terms.items()) % self.modulo
+			return sum(c * x ** e for e, c in self._terms.items())
+		
 		total = self.leading
 		for i in range(len(self) - 2, -1, -1):
 			total *= x
-			total += self.coefficients[i]
+			total += self._coefs[i]
+			if self.modulo is not None:
+				total %= self.modulo  # Keep the intermediate values from growing
 		
 		if self.modulo is not None:
 			total %= self.modulo
 		return total
 	
+	def evaluate_many(self, points):
+		"""
+		Values at every point of `points`, a sequence or a `SubproductTree`
+		Over Z/m large point sets go down a cached subproduct tree in O(M(n) log n),
+		float data is evaluated with a vectorized NumPy Horner loop and anything else,
+		including int data, exactly point by point.
+		"""
+		
+		if isinstance(points, SubproductTree):
+			if self.modulo is not None and self.modulo != points.modulo:
+				raise ValueError("Artihmetic between Polynomials over Modular Rings must have same modulo")
+			return points.evaluate(self.coefficients)
+		elif len(self.coefficients) == 0:
+			return [0] * len(points)
+		elif self.modulo is not None and len(points) >= SUBPRODUCT_THRESHOLD and self.degree >= SUBPRODUCT_LEAF:
+			return SubproductTree.cached(points, self.modulo).evaluate(self.coefficients)
+		
+		types = set(map(type, chain(self.coefficients, points))) if np is not None and self.modulo is None else ()
+		if float in types and types <= {int, float}:
+			xs = np.asarray(points, dtype=np.float64)
+			total = np.zeros_like(xs)
+			for c in reversed(self.coefficients):
+				total *= xs
+				total += c
+			return total.tolist()
+		
+		return [self(x) for x in points]
+	
+	@staticmethod
+	def interpolate(xs, ys, modulo=None):
+		"""
+		Polynomial of degree below len(xs) through the points (xs[i], ys[i])
+		Over Z/m this combines the values up a cached subproduct tree in O(M(n) log n),
+		otherwise it expands Newton's divided differences in O(n^2).
+		
+		Args:
+			xs -- Distinct sample points or a `SubproductTree` over them
+			ys -- Values at the sample points
+			modulo (int) -- Modulus of the coefficient ring (default None)
+		"""
+		
+		if len(xs) != len(ys):
+			raise ValueError(f"Point-Value count mismatch between {len(xs)} and {len(ys)}")
+		elif len(xs) == 0:
+			return Polynomial(modulo=modulo)
+		
+		if modulo is not None:
+			tree = xs if isinstance(xs, SubproductTree) else SubproductTree.cached(xs, modulo)
+			if len(set(tree.points)) != len(tree.points):
+				raise ValueError("Interpolation points must be distinct")
+			
+			# Lagrange weights y_i / M'(x_i) where M is the product of all (x - x_i)
+			derivs = tree.evaluate(Polynomial(*tree.root, modulo=modulo).derivative().coefficients)
+			return Polynomial(*tree.combine([y * d % modulo for y, d in zip(ys, _batchInverse(derivs, modulo))]), modulo=modulo)
+		
+		if len(set(xs)) != len(xs):
+			raise ValueError("Interpolation points must be distinct")
+		
+		n = len(xs)
+		diffs = list(ys)
+		for j in range(1, n):
+			for i in range(n - 1, j - 1, -1):
+				diffs[i] = (diffs[i] - diffs[i - 1]) / (xs[i] - xs[i - j])
+		
+		# Expand c_0 + (x - x_0)(c_1 + (x - x_1)(c_2 + ...)) from the inside out
+		cfs = [diffs[-1]]
+		for i in range(n - 2, -1, -1):
+			ncfs = [0] + cfs
+			for k, c in enumerate(cfs):
+				ncfs[k] += -xs[i] * c
+			ncfs[0] += diffs[i]
+			cfs = ncfs
+		return Polynomial(*cfs)
+	
+	def derivative(self):
+		if self._terms is not None:
+			return Polynomial.fromterms({e - 1: e * c for e, c in self._terms.items() if e > 0}, modulo=self.modulo)
+		return Polynomial(*(i * c for i, c in enumerate(self.coefficients[1:], 1)), modulo=self.modulo)
+	
+	
+	
 	def __str__(self):
-		self._trimzeros()
 		if len(self) == 0:
 			return '0'
 		
 		ss, isfirst = '', True
-		for i in range(len(self.coefficients)):
-			cf = self.coefficients[i]
+		for i, cf in sorted(self.terms.items()):
 			if cf == 0:
 				continue
 			
@@ -301,10 +468,802 @@ class Polynomial:
 		return ss
 	
 	def __repr__(self):
-		self._trimzeros()
 		modstr = ''
 		if self.modulo is not None:
 			modstr = ', modulo=' + str(self.modulo)
 		
+		if self._terms is not None:
+			return 'Polynomial.fromterms(' + repr(dict(sorted(self._terms.items()))) + modstr + ')'
 		return 'Polynomial(' + ', '.join(map(repr, self.coefficients)) + modstr + ')'
 
+
+
+# Shortest operand for which multiplication switches from schoolbook to Karatsuba
+KARATSUBA_THRESHOLD = 32
+# Smallest product length for which int and float coefficients use an NTT or FFT
+TRANSFORM_THRESHOLD = 256
+# Smallest divisor degree and quotient length for which division uses Newton inversion
+DIVISION_THRESHOLD = 64
+
+def _padd(a, b):
+	if len(a) < len(b):
+		a, b = b, a
+	return [x + y for x, y in zip(a, b)] + list(a[len(b):])
+
+def _schoolbook(a, b):
+	out = [0] * (len(a) + len(b) - 1)
+	for i, x in enumerate(a):
+		for j, y in enumerate(b):
+			out[i + j] += x * y
+	return out
+
+def _karatsuba(a, b):
+	""" Product of two coefficient sequences over any ring, O(n^1.59) """
+	if len(a) < len(b):
+		a, b = b, a
+	n, m = len(a), len(b)
+	if m < KARATSUBA_THRESHOLD:
+		return _schoolbook(a, b)
+	
+	out = [0] * (n + m - 1)
+	if 2 * m <= n:
+		# Unbalanced operands, multiply `b` by chunks of `a` of its own length
+		for i in range(0, n, m):
+			for k, c in enumerate(_karatsuba(a[i:i + m], b), i):
+				out[k] += c
+		return out
+	
+	# (a0 + a1 x^h)(b0 + b1 x^h) = z0 + ((a0 + a1)(b0 + b1) - z0 - z2) x^h + z2 x^2h
+	h = n // 2
+	z0 = _karatsuba(a[:h], b[:h])
+	z2 = _karatsuba(a[h:], b[h:])
+	z1 = _karatsuba(_padd(a[:h], a[h:]), _padd(b[:h], b[h:]))
+	for i, c in enumerate(z0):
+		out[i] += c
+		out[i + h] += -c
+	for i, c in enumerate(z2):
+		out[i + 2 * h] += c
+		out[i + h] += -c
+	for i, c in enumerate(z1):
+		out[i + h] += c
+	return out
+
+
+
+# NTT primes c * 2^23 + 1 below 2^30 in descending order paired with a primitive root
+_NTT_PRIMES = []
+# Primitive roots of NTT friendly moduli, None for moduli that are not prime
+_NTT_ROOTS = {}
+NTT_MAX_LENGTH = 1 << 23
+
+def _nttPrimes():
+	if not _NTT_PRIMES:
+		for c in range(((1 << 30) - 1) >> 23, 0, -1):
+			p = c * NTT_MAX_LENGTH + 1
+			if primes.isprime(p):
+				_NTT_PRIMES.append((p, modulo.primitive_root(p)))
+	return _NTT_PRIMES
+
+def _nttRoot(mod, size):
+	""" Primitive root of `mod` if it is a prime supporting transforms of length `size`, else None """
+	if mod is None or mod >= 1 << 31 or (mod - 1) % size:
+		return None
+	if mod not in _NTT_ROOTS:
+		_NTT_ROOTS[mod] = modulo.primitive_root(mod) if primes.isprime(mod) else None
+	return _NTT_ROOTS[mod]
+
+def _twiddles(w, half, p):
+	tw = [1] * half
+	for j in range(1, half):
+		tw[j] = tw[j - 1] * w % p
+	return tw
+
+def _ntt(a, p, w, inverse=False):
+	"""
+	In place transform of the list or uint64 array `a` of power of two length
+	with the primitive length-th root of unity `w`. The forward transform is decimation
+	in frequency leaving the output in bit reversed order which the decimation in
+	time inverse consumes, so no permutation pass is needed.
+	"""
+	
+	n = len(a)
+	lengths = []
+	length = n
+	while length > 1:
+		lengths.append(length)
+		length >>= 1
+	if inverse:
+		lengths.reverse()
+		w = pow(w, -1, p)
+	
+	for length in lengths:
+		half = length >> 1
+		tw = _twiddles(pow(w, n // length, p), half, p)
+		if np is not None:
+			blocks = a.reshape(-1, length)
+			tw = np.array(tw, dtype=np.uint64)
+			mod = np.uint64(p)
+			u = blocks[:, :half].copy()
+			v = blocks[:, half:] if not inverse else modulo._mulmodArray(blocks[:, half:], tw, p)
+			s = u + v
+			d = u + mod - v
+			s -= np.where(s >= mod, mod, np.uint64(0))
+			d -= np.where(d >= mod, mod, np.uint64(0))
+			blocks[:, :half] = s
+			blocks[:, half:] = d if inverse else modulo._mulmodArray(d, tw, p)
+			continue
+		
+		for start in range(0, n, length):
+			for j in range(start, start + half):
+				u, v = a[j], a[j + half]
+				if inverse:
+					v = v * tw[j - start] % p
+					a[j], a[j + half] = (u + v) % p, (u - v) % p
+				else:
+					a[j], a[j + half] = (u + v) % p, (u - v) * tw[j - start] % p
+	
+	if inverse:
+		ninv = pow(n, -1, p)
+		if np is not None:
+			a[:] = modulo._mulmodArray(a, np.uint64(ninv), p)
+		else:
+			a[:] = [x * ninv % p for x in a]
+	return a
+
+def _nttMultiply(a, b, p, g):
+	""" Cyclic convolution of residue lists modulo the NTT prime p with primitive root g """
+	length = len(a) + len(b) - 1
+	size = 1 << (length - 1).bit_length()
+	w = pow(g, (p - 1) // size, p)
+	
+	if np is not None:
+		fa, fb = np.zeros(size, dtype=np.uint64), np.zeros(size, dtype=np.uint64)
+		fa[:len(a)], fb[:len(b)] = a, b
+		prod = modulo._mulmodArray(_ntt(fa, p, w), _ntt(fb, p, w), p)
+		return _ntt(prod, p, w, inverse=True)[:length].tolist()
+	
+	fa = _ntt(list(a) + [0] * (size - len(a)), p, w)
+	fb = _ntt(list(b) + [0] * (size - len(b)), p, w)
+	return _ntt([x * y % p for x, y in zip(fa, fb)], p, w, inverse=True)[:length]
+
+def _nttCapacity():
+	""" Bits of the largest symmetric range the NTT primes can reconstruct """
+	prod = 1
+	for p, _ in _nttPrimes():
+		prod *= p
+	return prod.bit_length() - 2
+
+def _nttBound(a, b):
+	""" Bound on the absolute value of the coefficients of the integer product """
+	return min(len(a), len(b)) * max(map(abs, a)) * max(map(abs, b))
+
+def _nttCRT(a, b, bound):
+	"""
+	Exact integer convolution from NTTs modulo several primes whose product
+	exceeds `2 * bound`, recombined with a symmetric Garner reconstruction
+	"""
+	
+	moduli, prod = [], 1
+	for p, g in _nttPrimes():
+		if prod > 2 * bound:
+			break
+		moduli.append((p, g))
+		prod *= p
+	else:
+		if prod <= 2 * bound:
+			raise OverflowError("Coefficients too large for the NTT prime set")
+	
+	images = [_nttMultiply([x % p for x in a], [y % p for y in b], p, g) for p, g in moduli]
+	basis = modulo.CRTBasis([p for p, _ in moduli])
+	return basis.reconstruct_many(zip(*images), symmetric=True)
+
+def _fftMultiply(a, b):
+	""" Product of real or complex coefficient lists by NumPy's FFT """
+	length = len(a) + len(b) - 1
+	size = 1 << (length - 1).bit_length()
+	if any(isinstance(c, complex) for c in chain(a, b)):
+		return np.fft.ifft(np.fft.fft(a, size) * np.fft.fft(b, size))[:length].tolist()
+	return np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)[:length].tolist()
+
+def _chooseMethod(a, b, mod):
+	if min(len(a), len(b)) < KARATSUBA_THRESHOLD:
+		return 'schoolbook'
+	
+	length = len(a) + len(b) - 1
+	if length >= TRANSFORM_THRESHOLD:
+		ints = all(type(c) is int for c in chain(a, b))
+		if ints and length <= NTT_MAX_LENGTH:
+			if mod is None:
+				bound = _nttBound(a, b)
+			elif _nttRoot(mod, 1 << (length - 1).bit_length()) is not None:
+				return 'ntt'
+			else:
+				bound = min(len(a), len(b)) * (mod - 1) ** 2
+			
+			if bound.bit_length() < _nttCapacity():
+				return 'ntt'
+		elif not ints and np is not None and mod is None and all(type(c) in (int, float, complex) for c in chain(a, b)):
+			return 'fft'
+	return 'karatsuba'
+
+def multiply(a, b, mod=None, method=None):
+	"""
+	Coefficient list of the product of two coefficient sequences
+	By default schoolbook is used for short operands, an NTT for long int coefficients
+	(a single prime when `mod` is NTT friendly, otherwise several primes and CRT),
+	an FFT for long real coefficients when NumPy is available and Karatsuba otherwise.
+	
+	Args:
+		a, b -- Coefficients from the constant term up
+		mod (int) -- Modulus the coefficients are reduced by (default None)
+		method (str) -- Force 'schoolbook', 'karatsuba', 'ntt' or 'fft'
+	
+	Returns:
+		list -- Coefficients of the product, reduced if `mod` is given
+	"""
+	
+	if len(a) == 0 or len(b) == 0:
+		return []
+	
+	method = _chooseMethod(a, b, mod) if method is None else method
+	if method == 'schoolbook':
+		out = _schoolbook(a, b)
+	elif method == 'karatsuba':
+		out = _karatsuba(a, b)
+	elif method == 'fft':
+		if np is None:
+			raise ImportError("NumPy is required for FFT multiplication")
+		out = _fftMultiply(a, b)
+	elif method == 'ntt':
+		length = len(a) + len(b) - 1
+		g = _nttRoot(mod, 1 << (length - 1).bit_length())
+		if g is not None:
+			return _nttMultiply([x % mod for x in a], [y % mod for y in b], mod, g)
+		elif mod is not None:
+			a, b = [x % mod for x in a], [y % mod for y in b]
+			bound = min(len(a), len(b)) * (mod - 1) ** 2
+		else:
+			bound = _nttBound(a, b)
+		out = _nttCRT(a, b, bound)
+	else:
+		raise ValueError(f"Unknown multiplication method {method!r}")
+	
+	return out if mod is None else [c % mod for c in out]
+
+
+
+
+def _inverse(c, mod):
+	""" Inverse of a coefficient in the coefficient field """
+	if mod is not None:
+		return modulo.Modulo.invert(c, mod)
+	return 1 if c == 1 else 1 / c  # Keep exact coefficients for monic divisors
+
+def _seriesInverse(f, k, mod=None, start=None):
+	"""
+	First `k` coefficients of the power series 1 / f by Newton iteration
+	g <- g + g (1 - f g) mod x^2m, doubling the precision of the
+	approximation `start` (default 1 / f[0]) at the cost of two multiplications
+	"""
+	
+	inv = [_inverse(f[0], mod)] if not start else list(start)
+	while len(inv) < k:
+		m = len(inv)
+		size = min(2 * m, k)
+		# The low m coefficients of 1 - f g vanish
+		err = [-c for c in multiply(f[:size], inv, mod)[m:size]]
+		corr = multiply(inv[:size - m], err, mod)[:size - m]
+		inv += corr + [0] * (size - m - len(corr))
+		if mod is not None:
+			inv[m:] = [c % mod for c in inv[m:]]
+	return inv[:k]
+
+def _sparseDivmod(a, b, mod):
+	"""
+	Long division by a sparse divisor touching only its nonzero terms
+	Each quotient term costs O(nnz(b) log n) with a heap of pending exponents,
+	so reducing by polynomials such as x^p - x is linear in the dividend.
+	"""
+	
+	n = b.degree
+	invLead = _inverse(b.leading, mod)
+	lower = [(e, c) for e, c in b.terms.items() if e != n]
+	
+	rem = dict(a.terms)
+	quot = {}
+	heap = [-e for e in rem if e >= n]
+	heapify(heap)
+	while heap:
+		e = -heappop(heap)
+		c = rem.pop(e, 0)
+		if mod is not None:
+			c %= mod
+		if c == 0:
+			continue
+		
+		q = c * invLead if mod is None else c * invLead % mod
+		quot[e - n] = q
+		for e2, c2 in lower:
+			t = e2 + e - n
+			if t >= n and t not in rem:
+				heappush(heap, -t)
+			rem[t] = rem.get(t, 0) - q * c2
+	
+	return (Polynomial.fromterms(quot, modulo=mod), Polynomial.fromterms(rem, modulo=mod))
+
+class Divisor:
+	"""
+	Fixed divisor polynomial with a cached inverse of its reversed monic form
+	Dividing a polynomial with quotient length k by it costs two multiplications
+	rev(q) = rev(a) * rev(monic)^-1 mod x^k and r = a - q * monic, so repeated
+	reductions by one modulus never fall back to long division.
+	"""
+	
+	def __init__(self, poly, mod=None):
+		if len(poly.coefficients) == 0:
+			raise ZeroDivisionError('Polynomial divided by zero')
+		
+		self.poly = poly
+		self.modulo = mod
+		self.degree = poly.degree
+		self.leadInv = _inverse(poly.leading, mod)
+		
+		monic = [c * self.leadInv for c in poly.coefficients]
+		self.monic = monic if mod is None else [c % mod for c in monic]
+		self._revInv = []
+	
+	def _revInverse(self, k):
+		""" At least `k` coefficients of the inverse of the reversed monic divisor, grown on demand """
+		if len(self._revInv) < k:
+			self._revInv = _seriesInverse(self.monic[::-1], k, self.modulo, self._revInv)
+		return self._revInv
+	
+	def _divmod(self, a):
+		""" Quotient by the monic divisor and remainder as coefficient lists """
+		n, mod = self.degree, self.modulo
+		k = len(a) - n
+		if k <= 0:
+			return [], list(a)
+		
+		revq = multiply(a[::-1][:k], self._revInverse(k)[:k], mod)[:k]
+		q = revq[::-1]
+		if n == 0:
+			return q, []
+		
+		prod = multiply([-c for c in q], self.monic[:n], mod)
+		rem = [x + y for x, y in zip(a[:n], prod)]
+		return q, rem if mod is None else [c % mod for c in rem]
+	
+	def reduce(self, a):
+		""" Remainder of the coefficient sequence `a` as a list """
+		return self._divmod(a)[1]
+	
+	def divmod(self, a):
+		""" Quotient and remainder of the Polynomial `a` """
+		if a.modulo is not None and a.modulo != self.modulo:
+			raise ValueError("Artihmetic between Polynomials over Modular Rings must have same modulo")
+		
+		q, r = self._divmod(a.coefficients)
+		return (Polynomial(*(c * self.leadInv for c in q), modulo=self.modulo), Polynomial(*r, modulo=self.modulo))
+	
+	def __repr__(self):
+		return f'Divisor({self.poly!r})'
+
+def powmod(base, exp, modpoly):
+	"""
+	`base ^ exp` reduced modulo the polynomial `modpoly` after every step
+	The reductions go through the cached `Divisor` of `modpoly` so each costs
+	two multiplications instead of a long division.
+	
+	Args:
+		base (Polynomial) -- Polynomial to raise
+		exp (int) -- Non negative exponent
+		modpoly (Polynomial) -- Polynomial modulus
+	
+	Returns:
+		Polynomial -- `base ^ exp mod modpoly`
+	"""
+	
+	assert type(exp) == int and exp >= 0, "Polynomial can only be brought to a non negative integer power"
+	mod = base._findMod(modpoly)
+	if len(modpoly) == 0:
+		raise ZeroDivisionError('Polynomial divided by zero')
+	elif modpoly.degree == 0:
+		return Polynomial(modulo=mod)
+	
+	div = None if modpoly.issparse else modpoly.divisor(mod)
+	def reduce(cfs):
+		if div is not None:
+			return div.reduce(cfs)
+		return list(_sparseDivmod(Polynomial(*cfs, modulo=mod), modpoly, mod)[1].coefficients)
+	
+	base = reduce(Polynomial(*base.coefficients, modulo=mod).coefficients)
+	result = [1]
+	for bit in bin(exp)[2:]:
+		result = reduce(multiply(result, result, mod))
+		if bit == '1':
+			result = reduce(multiply(result, base, mod))
+	
+	return Polynomial(*result, modulo=mod)
+
+
+
+# Point sets with at least this many points are evaluated through subproduct trees (Z/m only)
+SUBPRODUCT_THRESHOLD = 256
+# Tree nodes spanning at most this many points are finished by Horner's rule
+SUBPRODUCT_LEAF = 16
+# Most recently used subproduct trees keyed by point set and modulus
+_TREES = {}
+TREE_CACHE_SIZE = 16
+
+def _horner(cfs, x, mod):
+	total = 0
+	for c in reversed(cfs):
+		total = (total * x + c) % mod
+	return total
+
+def _batchInverse(vals, mod):
+	""" Inverses of residues mod `mod` by Montgomery's trick """
+	if mod < 1 << 63:
+		return modulo.ModArray(vals, mod).inverse().tolist()
+	return [modulo.Modulo.invert(v, mod) % mod for v in vals]
+
+class SubproductTree:
+	"""
+	Products of (x - p) over dyadic blocks of a fixed point set modulo `mod`
+	`levels[0]` holds the linear factors and `levels[i][j]` the product over the points
+	j 2^i up to (j + 1) 2^i, the root is the product over every point. Divisors of the
+	nodes are cached so evaluating many polynomials at one point set only pays once.
+	"""
+	
+	def __init__(self, points, mod):
+		self.points = tuple(p % mod for p in points)
+		self.modulo = mod
+		
+		level = [[-p % mod, 1] for p in self.points]
+		self.levels = [level]
+		while len(level) > 1:
+			level = [multiply(level[i], level[i + 1], mod) if i + 1 < len(level) else level[i]
+				for i in range(0, len(level), 2)]
+			self.levels.append(level)
+		
+		self._divisors = {}
+	
+	@staticmethod
+	def cached(points, mod):
+		""" Tree over `points` from the cache of recently used trees """
+		key = (tuple(points), mod)
+		tree = _TREES.pop(key, None)
+		if tree is None:
+			tree = SubproductTree(points, mod)
+			if len(_TREES) >= TREE_CACHE_SIZE:
+				del _TREES[next(iter(_TREES))]
+		_TREES[key] = tree  # Reinsert as most recently used
+		return tree
+	
+	def __len__(self):
+		return len(self.points)
+	
+	@property
+	def root(self):
+		return self.levels[-1][0] if self.points else [1]
+	
+	def _divisor(self, i, j):
+		if (i, j) not in self._divisors:
+			self._divisors[i, j] = Divisor(Polynomial(*self.levels[i][j], modulo=self.modulo), self.modulo)
+		return self._divisors[i, j]
+	
+	def evaluate(self, cfs):
+		""" Values of the coefficient sequence `cfs` at every point """
+		n, mod = len(self.points), self.modulo
+		out = [0] * n
+		if n == 0:
+			return out
+		
+		# Reduce modulo the node polynomial on the way down, the remainder at a node
+		# agrees with the polynomial on the node's points
+		stack = [(len(self.levels) - 1, 0, self._divisor(len(self.levels) - 1, 0).reduce(cfs))]
+		while stack:
+			i, j, rem = stack.pop()
+			lo = j << i
+			hi = min(lo + (1 << i), n)
+			if hi - lo <= SUBPRODUCT_LEAF or i == 0:
+				for k in range(lo, hi):
+					out[k] = _horner(rem, self.points[k], mod)
+				continue
+			
+			for child in (2 * j, 2 * j + 1):
+				if child < len(self.levels[i - 1]):
+					stack.append((i - 1, child, self._divisor(i - 1, child).reduce(rem)))
+		return out
+	
+	def combine(self, weights):
+		""" Coefficients of the sum of weights[i] * root / (x - points[i]) """
+		mod = self.modulo
+		level = [[w % mod] for w in weights]
+		for nodes in self.levels[:-1]:
+			nlevel = []
+			for i in range(0, len(level), 2):
+				if i + 1 < len(level):
+					left = multiply(level[i], nodes[i + 1], mod)
+					right = multiply(level[i + 1], nodes[i], mod)
+					nlevel.append([c % mod for c in _padd(left, right)])
+				else:
+					nlevel.append(level[i])
+			level = nlevel
+		return level[0] if level else []
+	
+	def __repr__(self):
+		return f'SubproductTree({list(self.points)}, {self.modulo})'
+
+
+
+# Degree below which the half-GCD recursion falls back to Euclidean steps
+HGCD_THRESHOLD = 64
+
+def _coefs(poly):
+	return list(poly.coefficients)
+
+def _trim(cfs, mod):
+	if mod is not None:
+		cfs = [c % mod for c in cfs]
+	while cfs and cfs[-1] == 0:
+		cfs.pop()
+	return cfs
+
+def _lsub(a, b, mod):
+	return _trim(_padd(a, [-c for c in b]), mod)
+
+def _ldivmod(a, b, mod):
+	q, r = Polynomial.divmod(Polynomial(*a, modulo=mod), Polynomial(*b, modulo=mod))
+	return _coefs(q), _coefs(r)
+
+def _matmul(s, r, mod):
+	""" Product of 2x2 matrices of coefficient lists """
+	return tuple(tuple(_trim(_padd(multiply(s[i][0], r[0][j], mod), multiply(s[i][1], r[1][j], mod)), mod)
+		for j in range(2)) for i in range(2))
+
+def _apply(r, a, b, mod):
+	return (_trim(_padd(multiply(r[0][0], a, mod), multiply(r[0][1], b, mod)), mod),
+		_trim(_padd(multiply(r[1][0], a, mod), multiply(r[1][1], b, mod)), mod))
+
+def _euclidStep(r, a, b, mod):
+	""" One division step (a, b) -> (b, a mod b) composed onto the matrix r """
+	q, rem = _ldivmod(a, b, mod)
+	step = (([], [1]), ([1], _trim([-c for c in q], mod)))
+	return _matmul(step, r, mod), b, rem
+
+def _hgcd(a, b, mod):
+	"""
+	Half-GCD of coefficient lists with deg a > deg b
+	Returns the matrix R of the Euclidean steps with (a', b') = R (a, b) and
+	deg a' >= m > deg b' for m = ceil(deg a / 2). The quotients depend only on the
+	top halves so they are found recursively from a div x^m and b div x^m.
+	"""
+	
+	ident = (([1], []), ([], [1]))
+	n = len(a) - 1
+	m = (n + 1) // 2
+	if len(b) - 1 < m:
+		return ident
+	
+	if n < HGCD_THRESHOLD:
+		r = ident
+		while len(b) - 1 >= m:
+			r, a, b = _euclidStep(r, a, b, mod)
+		return r
+	
+	r = _hgcd(a[m:], b[m:], mod)
+	a, b = _apply(r, a, b, mod)
+	if len(b) - 1 < m:
+		return r
+	
+	r, a, b = _euclidStep(r, a, b, mod)
+	k = 2 * m - (len(a) - 1)
+	return _matmul(_hgcd(a[k:], b[k:], mod), r, mod)
+
+def _gcdMatrix(a, b, mod):
+	""" Monic gcd of coefficient lists and the matrix R with R (a, b) = (gcd, 0) up to a scalar """
+	r = (([1], []), ([], [1]))
+	if len(a) < len(b):
+		a, b = b, a
+		r = (([], [1]), ([1], []))
+	
+	while b:
+		if len(a) - 1 >= HGCD_THRESHOLD:
+			h = _hgcd(a, b, mod)
+			a, b = _apply(h, a, b, mod)
+			r = _matmul(h, r, mod)
+			if not b:
+				break
+		r, a, b = _euclidStep(r, a, b, mod)
+	return a, r
+
+def gcd(a, b):
+	"""
+	Monic greatest common divisor of two Polynomials over a field
+	(`modulo` prime or exact rational coefficients) by half-GCD in O(M(n) log n)
+	"""
+	
+	mod = a._findMod(b)
+	g, _ = _gcdMatrix(_coefs(a), _coefs(b), mod)
+	if not g:
+		return Polynomial(modulo=mod)
+	inv = _inverse(g[-1], mod)
+	return Polynomial(*(c * inv for c in g), modulo=mod)
+
+def xgcd(a, b):
+	"""
+	Extended gcd of two Polynomials over a field
+	
+	Returns:
+		(Polynomial, Polynomial, Polynomial) -- monic g with s, t such that s a + t b = g
+	"""
+	
+	mod = a._findMod(b)
+	g, r = _gcdMatrix(_coefs(a), _coefs(b), mod)
+	if not g:
+		return Polynomial(modulo=mod), Polynomial(modulo=mod), Polynomial(modulo=mod)
+	
+	inv = _inverse(g[-1], mod)
+	return tuple(Polynomial(*(c * inv for c in cfs), modulo=mod) for cfs in (g, r[0][0], r[0][1]))
+
+def resultant(a, b):
+	""" Resultant of two Polynomials over a field by the Euclidean remainder sequence """
+	mod = a._findMod(b)
+	a, b = _coefs(a), _coefs(b)
+	if not a or not b:
+		return 0
+	
+	res = 1
+	while len(b) > 1:
+		_, r = _ldivmod(a, b, mod)
+		if not r:
+			return 0
+		
+		# Res(a, b) = (-1)^(deg a deg b) lc(b)^(deg a - deg r) Res(b, r)
+		da, db = len(a) - 1, len(b) - 1
+		res *= (-1) ** (da * db) * b[-1] ** (da - len(r) + 1)
+		if mod is not None:
+			res %= mod
+		a, b = b, r
+	
+	res *= b[-1] ** (len(a) - 1)
+	return res if mod is None else res % mod
+
+
+
+def _monic(poly):
+	cfs = _coefs(poly)
+	inv = _inverse(cfs[-1], poly.modulo)
+	return Polynomial(*(c * inv for c in cfs), modulo=poly.modulo)
+
+def _isone(poly):
+	return poly.degree == 0 and len(poly) > 0
+
+def squarefree_decomposition(f):
+	"""
+	Square-free decomposition of a Polynomial over a field
+	In characteristic p (`modulo` prime) the factors whose multiplicity is
+	a multiple of p are recovered from the p-th root of the remaining part.
+	
+	Returns:
+		list -- [(g, k)] with monic square-free pairwise coprime g and f = lc(f) * prod g^k
+	"""
+	
+	if len(f) == 0:
+		raise ValueError("Zero Polynomial has no square-free decomposition")
+	
+	mod = f.modulo
+	f = _monic(f)
+	result = []
+	
+	c = gcd(f, f.derivative())
+	w = f // c
+	k = 1
+	while not _isone(w):
+		y = gcd(w, c)
+		fac = w // y
+		if not _isone(fac):
+			result.append((fac, k))
+		w, c = y, c // y
+		k += 1
+	
+	if mod is not None and not _isone(c):
+		# Only powers of x^p are left, c = g(x^p) = g(x)^p over GF(p)
+		root = Polynomial(*_coefs(c)[::mod], modulo=mod)
+		result += [(g, e * mod) for g, e in squarefree_decomposition(root)]
+		result.sort(key=lambda fac: fac[1])
+	return result
+
+def distinct_degree(f):
+	"""
+	Distinct-degree factorization of a monic square-free Polynomial over GF(p)
+	
+	Returns:
+		list -- [(g, d)] where g is the product of the irreducible factors of degree d
+	"""
+	
+	p = f.modulo
+	x = Polynomial(0, 1, modulo=p)
+	result = []
+	h, d = x, 1
+	while f.degree >= 2 * d:
+		# h = x^(p^d) mod f, the gcd with x^(p^d) - x collects the factors of degree d
+		h = powmod(h, p, f)
+		g = gcd(h - x, f)
+		if not _isone(g):
+			result.append((g, d))
+			f = f // g
+			h = h % f
+		d += 1
+	
+	if f.degree > 0:
+		result.append((f, f.degree))
+	return result
+
+def equal_degree(f, d, rand=None):
+	"""
+	Cantor-Zassenhaus splitting of a monic Polynomial over GF(p) that is the product
+	of irreducible factors of degree `d` into those factors
+	"""
+	
+	rand = random if rand is None else rand
+	p = f.modulo
+	n = f.degree
+	if n <= d:
+		return [f]
+	
+	one = Polynomial(1, modulo=p)
+	while True:
+		a = Polynomial(*(rand.randrange(p) for _ in range(n)), modulo=p)
+		if a.degree <= 0:
+			continue
+		
+		if p == 2:
+			# Trace map a + a^2 + ... + a^(2^(nd - 1)) splits in characteristic 2
+			b, t = a % f, a % f
+			for _ in range(d - 1):
+				t = powmod(t, 2, f)
+				b = b + t
+		else:
+			b = powmod(a, (p ** d - 1) // 2, f) - one
+		
+		g = gcd(b, f)
+		if 0 < g.degree < n:
+			return equal_degree(g, d, rand) + equal_degree(f // g, d, rand)
+
+def factor(f):
+	"""
+	Factorization of a Polynomial over GF(p) into monic irreducibles
+	
+	Returns:
+		(int, list) -- leading coefficient and [(factor, multiplicity)]
+	"""
+	
+	if f.modulo is None or not primes.isprime(f.modulo):
+		raise ValueError("Factorization requires a Polynomial with prime modulo")
+	
+	lead = f.leading
+	result = []
+	for g, k in squarefree_decomposition(f):
+		for h, d in distinct_degree(g):
+			result += [(fac, k) for fac in equal_degree(h, d)]
+	
+	result.sort(key=lambda fac: (fac[0].degree, fac[0].coefficients, fac[1]))
+	return lead, result
+
+def roots(f):
+	""" Distinct roots in GF(p) of a Polynomial with prime modulo in ascending order """
+	p = f.modulo
+	if p is None or not primes.isprime(p):
+		raise ValueError("Root finding requires a Polynomial with prime modulo")
+	if len(f) == 0:
+		raise ValueError("Every element is a root of the zero Polynomial")
+	
+	# Only the linear factors matter, gcd with x^p - x keeps exactly those
+	x = Polynomial(0, 1, modulo=p)
+	g = gcd(f, powmod(x, p, f) - x) if f.degree > 0 else Polynomial(1, modulo=p)
+	if g.degree == 0:
+		return []
+	return sorted(-lin[0] % p for lin in equal_degree(g, 1))
@@ -24,7 +24,7 @@ class ModPoly(pl.Polynomial):
 	
 	def _modPower(self):
 		if self.degree >= self.maxpow:
-			self = self.__mod__(self.polyMod)
+			self.coefficients = pl.Polynomial.divmod(self, self.polyMod)[1].coefficients
 	
 	
 	def __eq__(self, other):
@@ -66,7 +66,7 @@ class ModPoly(pl.Polynomial):
 		return ModPoly.frompoly(self.modulo, super().__rmul__(other), maxpow=self.maxpow, polyMod=self.polyMod)
 	
 	def __pow__(self, other):
-		return ModPoly.frompoly(self.modulo, super().__pow__(other), maxpow=self.maxpow, polyMod=self.polyMod)
+		return ModPoly.frompoly(self.modulo, pl.powmod(self, other, self.polyMod), maxpow=self.maxpow, polyMod=self.polyMod)
 	
 	
 	def __repr__(self):
@@ -75,26 +75,60 @@ class ModPoly(pl.Polynomial):
 
 
 
+def _points(modulo):
+	""" Subproduct tree over every residue of Z/modulo """
+	return pl.SubproductTree.cached(range(modulo), modulo)
+
 def permToPoly(perm, modulo):
-	fixed = list(range(0, modulo))
-	mvd = tuple(perm.moved())
-	
-	for m in mvd:
-		fixed.remove(m)
-	
-	# Generate fixed polynomial
-	fixedPoly = ModPoly.fromroots(1, modulo, *fixed)
-	
-	# Generate shifter for elements that are moved
-	shifter = ModPoly(modulo)
-	for x in mvd:
-		allButX = (m for m in mvd if m != x)
-		shifter += ModPoly.fromroots(-(perm(x) - x), modulo, *allButX)
-	
-	return shifter * fixedPoly + ModPoly(modulo, 0, 1)
+	""" Polynomial over Z/modulo, for a prime modulo, acting on the residues as `perm` """
+	return permsToPolys((perm,), modulo)[0]
+
+def permsToPolys(perms, modulo):
+	"""
+	Polynomials over Z/modulo acting on the residues as each of `perms`
+	Every Polynomial interpolates its images over all of Z/p which shares one subproduct tree.
+	The tree's root is x^p - x whose derivative is -1, so the Lagrange weights are the
+	negated images and each conversion only costs the O(M(p) log p) combination.
+	
+	Args:
+		perms -- Permutations of the residues mod `modulo`
+		modulo (int) -- Prime modulus of the coefficient ring
+	
+	Returns:
+		list -- ModPoly of degree below `modulo` for each Permutation
+	"""
+	
+	tree = _points(modulo)
+	polys, polyMod = [], None
+	for perm in perms:
+		weights = [-y for y in perm.images(modulo)]
+		poly = ModPoly(modulo, *tree.combine(weights), polyMod=polyMod)
+		polyMod = poly.polyMod
+		polys.append(poly)
+	return polys
 
 def polyToPerm(poly):
-	if poly.modulo is None:
-		raise TypeError("Polynomial must be over Modular Ring to correspond to Permutation")
-	
-	return prm.Permutation.fromfunc(poly, range(0, poly.modulo))
+	return polysToPerms((poly,))[0]
+
+def polysToPerms(polys):
+	"""
+	Permutations of Z/p given by Polynomials over Z/p
+	Every Polynomial is evaluated at all of Z/p down one shared subproduct tree.
+	
+	Raises:
+		TypeError -- a Polynomial has no modulo or does not permute the residues
+		ValueError -- the Polynomials are over different modular rings
+	"""
+	
+	perms, modulo = [], None
+	for poly in polys:
+		if poly.modulo is None:
+			raise TypeError("Polynomial must be over Modular Ring to correspond to Permutation")
+		elif modulo is None:
+			modulo = poly.modulo
+			tree = _points(modulo)
+		elif poly.modulo != modulo:
+			raise ValueError("Artihmetic between Polynomials over Modular Rings must have same modulo")
+		
+		perms.append(prm.Permutation.fromimages(poly.evaluate_many(tree)))
+	return perms
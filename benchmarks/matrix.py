@@ -0,0 +1,25 @@
+"""
+Benchmark of the O(n^3) determinant, characteristic polynomial and eigenvalue routines
+Run as `python -m xmath.benchmarks.matrix`, doubling n should take roughly 8 times as long
+"""
+
+import random
+import time
+
+from ..linear.matrix import Matrix
+
+def main():
+	for n in (25, 50, 100):
+		ints = Matrix(*([random.randint(-9, 9) for c in range(n)] for r in range(n)))
+		floats = Matrix(*([random.gauss(0, 1) for c in range(n)] for r in range(n)))
+		
+		for name, func in (('det int', ints.det), ('charpoly int', ints.charpoly),
+			('charpoly float', floats.charpoly), ('eigenvalues', floats.eigenvalues)):
+			start = time.perf_counter()
+			func()
+			print(f"n = {n:4d} {name:15s} {time.perf_counter() - start:.4f}s")
+
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,30 @@
+"""
+Benchmark of the polynomial multiplication methods on random operands of n coefficients
+Run as `python -m xmath.benchmarks.polynomial`, schoolbook is skipped once it gets too slow
+"""
+
+import random
+import time
+
+from ..algebra import polynomial
+from ..algebra.polynomial import multiply
+
+def main():
+	p = 998244353
+	for n in (64, 256, 1024, 4096, 16384):
+		ints = [random.randrange(p) for _ in range(n)], [random.randrange(p) for _ in range(n)]
+		floats = [random.gauss(0, 1) for _ in range(n)], [random.gauss(0, 1) for _ in range(n)]
+		
+		for name, a, b, mod, method in (('schoolbook', *ints, p, 'schoolbook'), ('karatsuba', *ints, p, 'karatsuba'),
+			('ntt mod p', *ints, p, 'ntt'), ('ntt crt', *ints, None, 'ntt'), ('fft float', *floats, None, 'fft')):
+			if method == 'schoolbook' and n > 4096 or method == 'fft' and polynomial.np is None:
+				continue
+			
+			start = time.perf_counter()
+			multiply(a, b, mod, method)
+			print(f"n = {n:6d} {name:12s} {time.perf_counter() - start:.4f}s")
+
+
+
+if __name__ == '__main__':
+	main()
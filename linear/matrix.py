@@ -1,27 +1,80 @@
+from math import log, gcd, isqrt, sqrt
+from sys import float_info
+import operator
+
 from . import vector
+from .. import rational
+from ..algebra import modulo
+from ..algebra import polynomial
+from ..numbers import primes
+
+try:
+	import numpy as np
+except ImportError:  # NumPy is optional and only backs numeric matrices
+	np = None
 
 class Matrix:
-	def __init__(self, *rows):
-		self.rows = tuple(map(tuple, rows))
-		assert len(self.rows) > 0, "Matrix must have non-zero number of rows"
+	def __init__(self, *rows, dtype=None):
+		self._rows = tuple(map(tuple, rows))
+		assert len(self._rows) > 0, "Matrix must have non-zero number of rows"
 		
-		colNum = len(self.rows[0])
-		for row in self.rows:
+		colNum = len(self._rows[0])
+		for row in self._rows:
 			if len(row) != colNum:
 				raise ValueError(f"Dimension of row Vectors does not match {colNum} and {len(row)}")
+		
+		self._array = _toArray(self._rows, dtype)
+		if self._array is not None:
+			self._rows = None  # Tuple view is rebuilt from the array on demand
+	
+	@staticmethod
+	def fromArray(arr):
+		""" Wrap a two dimensional NumPy array without converting it to tuples """
+		if arr.ndim != 2 or arr.shape[0] == 0:
+			raise ValueError(f"Matrix must be built from a non-empty two dimensional array not shape {arr.shape}")
+		
+		mat = Matrix.__new__(Matrix)
+		mat._rows = None
+		mat._array = np.ascontiguousarray(arr)
+		return mat
+	
+	def save(self, path, dtype=None):
+		""" Write the Matrix to `path` in the binary format of `linear.outofcore` """
+		from . import outofcore
+		outofcore.save(self, path, dtype=dtype)
+	
+	@staticmethod
+	def open_mmap(path, mode='r'):
+		""" Open a saved Matrix file as a memory mapped `outofcore.MappedMatrix` """
+		from . import outofcore
+		return outofcore.MappedMatrix(path, mode=mode)
+	
+	@property
+	def rows(self):
+		""" Tuple of row tuples, converted lazily from the NumPy backend when needed """
+		if self._rows is None:
+			self._rows = tuple(map(tuple, self._array.tolist()))
+		return self._rows
+	
+	@property
+	def array(self):
+		""" Contiguous NumPy array backing this Matrix or None for generic element types """
+		return self._array
 	
 	@staticmethod
 	def fromRows(*rowVecs):
-		return Matrix(v.components for v in rowVecs)
+		return Matrix(*(v.components for v in rowVecs))
 	
 	@staticmethod
 	def fromColumns(colVecs):
-		return Matrix(v.components for v in colVecs).transpose()
+		return Matrix(*(v.components for v in colVecs)).transpose()
 	
 	
 	
 	@property
 	def shape(self):
+		if self._array is not None:
+			return self._array.shape
 		return (len(self.rows), len(self.rows[0]))
 	
 	def __eq__(self, other):
@@ -44,6 +97,8 @@ class Matrix:
 	
 	
 	def __getitem__(self, key):
+		if self._rows is None:
+			return self._array[key[0], key[1]].item()
 		return self.rows[key[0]][key[1]]
 	
 	def row(self, key):
@@ -75,6 +130,8 @@ class Matrix:
 		elif selfRows != otherRows:
 			raise ValueError(f"Matrix Row mismatch between {selfRows} and {otherRows}")	
 		
+		if self._array is not None and other._array is not None:
+			return Matrix.fromArray(self._array + other._array)
 		return Matrix(*(tuple(self.rows[r][c] + other.rows[r][c] for c in range(selfCols)) for r in range(selfRows)))
 	
 	def __sub__(self, other):
@@ -88,6 +145,8 @@ class Matrix:
 		elif selfRows != otherRows:
 			raise ValueError(f"Matrix Row mismatch between {selfRows} and {otherRows}")
 		
+		if self._array is not None and other._array is not None:
+			return Matrix.fromArray(self._array - other._array)
 		return Matrix(*(tuple(self.rows[r][c] - other.rows[r][c] for c in range(selfCols)) for r in range(selfRows)))
 	
 	def __mul__(self, other):
@@ -97,36 +156,19 @@ class Matrix:
 			if cs != otherRows:
 				raise ValueError(f"Matrix Row-Column mismatch between {cs} and {otherRows}")
 			
-			rows = []
-			for r in range(rs):
-				rowtmp = [None] * otherCols
-				for c in range(otherCols):
-					total = None
-					for k in range(cs):
-						prod = self.rows[r][k] * other.rows[k][c]
-						
-						if total is None:
-							total = prod
-						else:
-							total += prod
-					
-					rowtmp[c] = total
-				rows.append(rowtmp)
-			
-			return Matrix(*rows)
+			if self._array is not None and other._array is not None:
+				return Matrix.fromArray(self._array @ other._array)
+			return Matrix(*multiply(self.rows, other.rows))
 		elif isinstance(other, vector.Vector):
-			comps = [None] * cs
-			for r in range(rs):
-				total = None
-				for k in range(cs):
-					prod = self.rows[r][k] * other.components[k]
-					
-					if total is None:
-						total = prod
-					else:
-						total += prod
-				comps[r] = total
-			return vector.Vector(*comps)
+			if cs != len(other):
+				raise ValueError(f"Matrix Column mismatch with Vector between {cs} and {len(other)}")
+			
+			comps = other.components
+			if self._array is not None and _isnumeric(comps, requireFloat=False):
+				return vector.Vector(*(self._array @ np.array(comps)).tolist())
+			return vector.Vector(*(_dot(row, comps) for row in self.rows))
+		elif self._array is not None and type(other) in (int, float):
+			return Matrix.fromArray(self._array * other)
 		else:
 			return Matrix(*(tuple(other * self.rows[r][c] for c in range(cs)) for r in range(rs)))
 	
@@ -173,6 +215,10 @@ class Matrix:
 		if rows != cols:
 			raise ValueError("Only Square Matrices can be taken to a power")
 		
+		if self._array is not None:
+			work = self._array if other >= 0 else self.inverse()._array
+			return Matrix.fromArray(np.linalg.matrix_power(work, abs(other)))
+		
 		if other == 0:
 			return identity(rows)
 		elif other < 0:
@@ -194,6 +240,12 @@ class Matrix:
 		
 		return identity(rows) if prod is None else prod
 	
+	def powers(self):
+		""" Cached `MatrixPowers` for evaluating many large powers of this Matrix """
+		if getattr(self, '_powers', None) is None:
+			self._powers = MatrixPowers(self)
+		return self._powers
+	
 	
 	
 	def __repr__(self):
@@ -206,10 +258,18 @@ class Matrix:
 	
 	
 	def transpose(self):
+		if self._array is not None:
+			return Matrix.fromArray(self._array.T)
+		
 		rows, cols = self.shape
 		return Matrix(*(tuple(self.rows[r][c] for r in range(rows)) for c in range(cols)))
 	
 	def rref(self):
+		if self._array is not None:
+			return Matrix.fromArray(_rrefArray(self._array)[0])
+		elif _isintegral(self.rows):
+			return self.rref_exact()
+		
 		aug = AugmentedMatrix(self)
 		aug.reduce(0)
 		return aug[0]
@@ -219,33 +279,269 @@ class Matrix:
 		if rs != cs:
 			raise ValueError("Matrix Inverse can only be calculated for Square Matrices")
 		
-		aug = AugmentedMatrix(self, identity(rs))
-		aug.reduce(0)
-		if aug[0] != identity(rs):
-			raise ZeroDivisionError("Matrix is Singular")
+		if self._array is not None:
+			try:
+				return Matrix.fromArray(np.linalg.inv(self._array))
+			except np.linalg.LinAlgError:
+				raise ZeroDivisionError("Matrix is Singular")
 		
-		return aug[1]
+		# The LU factors of int entries are floats, decide singularity exactly instead
+		if _isintegral(self.rows) and self.det_exact() == 0:
+			raise ZeroDivisionError("Matrix is Singular")
+		return self.lu().inverse()
 	
-	def nullspace(self):
-		rs, cs = self.shape
+	def rank(self):
+		if self._array is not None:
+			return len(_rrefArray(self._array)[1])
+		elif _isintegral(self.rows):
+			return self.rank_exact()
+		
 		aug = AugmentedMatrix(self)
 		aug.reduce(0)
+		return aug.rank
+	
+	def trace(self):
+		rs, cs = self.shape
+		if rs != cs:
+			raise ValueError("Trace can only be calculated for Square Matrices")
+		
+		total = self.rows[0][0]
+		for i in range(1, rs):
+			total = total + self.rows[i][i]
+		return total
+	
+	def det(self):
+		"""
+		Determinant by elimination in O(n^3)
+		Uses LAPACK for NumPy backed matrices, elimination over the residues for Modulo
+		entries with a prime modulus, Bareiss elimination for int and Ratio entries
+		and the LU factorization for every other element type
+		"""
 		
-		# Get pivots
-		pivots = []
-		for r in range(rs):
-			col, _ = aug.leading(0, r)
-			if col is not None:
-				pivots.append(col)
+		rs, cs = self.shape
+		if rs != cs:
+			raise ValueError("Determinant can only be calculated for Square Matrices")
+		
+		if self._array is not None:
+			return float(np.linalg.det(self._array))
+		
+		rows, mod = _residueRows(self.rows)
+		if mod is not None and primes.isprime(mod):
+			return modulo.Modulo(_eliminateMod(rows, rs, mod)[0], mod)
+		
+		try:
+			return self.det_exact()
+		except TypeError:
+			return self.lu().det()
+	
+	def charpoly(self):
+		"""
+		Characteristic polynomial det(xI - A) as an `algebra.polynomial.Polynomial`
+		Reduces to upper Hessenberg form and applies the Hessenberg recurrence in O(n^3).
+		Float entries are handled directly, Modulo entries with a prime modulus over the
+		residues and int or Ratio entries exactly by working modulo several primes, each
+		costing O(n^3), and reconstructing with the Chinese Remainder Theorem. Other
+		element types, including Modulo entries with a composite modulus, fall back to
+		the division free Berkowitz algorithm in O(n^4).
+		"""
+		
+		n, cs = self.shape
+		if n != cs:
+			raise ValueError("Characteristic polynomial can only be calculated for Square Matrices")
+		
+		rows, mod = _residueRows(self.rows)
+		if mod is not None:
+			if primes.isprime(mod):
+				coefs = _hessenbergCharpoly(_hessenberg(rows, mod), mod)
 			else:
+				coefs = _berkowitz(rows, mod)
+			return polynomial.Polynomial(*coefs, modulo=mod)
+		
+		if self._array is not None or _isnumeric(x for row in rows for x in row):
+			return polynomial.Polynomial(*_hessenbergCharpoly(_hessenberg([list(map(float, row)) for row in rows])))
+		
+		try:
+			flat, scale = _integerRows([[x for row in rows for x in row]])
+		except TypeError:
+			return polynomial.Polynomial(*_berkowitz(rows))
+		
+		# Coefficients of det(xI - sA) are bounded by 2^n times powers of the largest column norm
+		intRows = [flat[0][r * n:(r + 1) * n] for r in range(n)]
+		norm = isqrt(max(sum(row[c] * row[c] for row in intRows) for c in range(n))) + 1
+		bound = (2 * norm) ** n
+		
+		moduli, residues = [], []
+		for p in _crtPrimes(bound):
+			moduli.append(p)
+			residues.append(_hessenbergCharpoly(_hessenberg([row[:] for row in intRows], p), p))
+		
+		coefs = [_crtSymmetric([res[k] for res in residues], moduli) for k in range(n + 1)]
+		return polynomial.Polynomial(*(_ratio(c, scale ** (n - k)) for k, c in enumerate(coefs)))
+	
+	def eigenvalues(self):
+		"""
+		Eigenvalues of a real Matrix using Hessenberg reduction followed by
+		Francis double shift QR iterations in O(n^3)
+		
+		Returns:
+			list -- eigenvalues as floats, or complex numbers for conjugate pairs
+		"""
+		
+		n, cs = self.shape
+		if n != cs:
+			raise ValueError("Eigenvalues can only be calculated for Square Matrices")
+		
+		if self._array is not None:
+			return [complex(v) if v.imag != 0 else float(v.real) for v in np.linalg.eigvals(self._array)]
+		
+		h = _hessenberg([list(map(float, row)) for row in self.rows])
+		return _hessenbergEigenvalues(h)
+	
+	def det_exact(self):
+		""" Determinant of an int or Ratio Matrix using Bareiss fraction-free elimination """
+		rs, cs = self.shape
+		if rs != cs:
+			raise ValueError("Determinant can only be calculated for Square Matrices")
+		
+		rows, scale = _integerRows(self.rows)
+		pivots, sign, last = _bareiss(rows, cs)
+		if len(pivots) < rs:
+			return 0
+		return _ratio(sign * last, scale)
+	
+	def rank_exact(self):
+		rows, _ = _integerRows(self.rows)
+		return len(_bareiss(rows, self.shape[1])[0])
+	
+	def rref_exact(self):
+		""" Reduced row echelon form with exact int or Ratio entries """
+		return Matrix(*_rrefExact(self.rows, self.shape[1])[0])
+	
+	def solve_exact(self, b):
+		"""
+		Solve `self * x = b` exactly for a square int or Ratio Matrix
+		
+		Args:
+			b (Vector or Matrix) -- Right-hand side or Matrix of right-hand side columns
+		
+		Returns:
+			Vector or Matrix -- solution with int and Ratio entries
+		"""
+		
+		n, cols = self.shape
+		if n != cols:
+			raise ValueError("Exact solve requires a Square Matrix")
+		
+		rhs = _rhsRows(b, n)
+		rows, _ = _integerRows([row + extra for row, extra in zip(self.rows, rhs)])
+		pivots, _, last = _bareiss(rows, n, jordan=True)
+		if len(pivots) < n:
+			raise ZeroDivisionError("Matrix is Singular")
+		
+		sol = [[_ratio(x, last) for x in row[n:]] for row in rows]
+		return _solution(b, sol)
+	
+	def det_modular(self):
+		"""
+		Determinant of an int or Ratio Matrix computed modulo several word sized primes
+		and reconstructed with the Chinese Remainder Theorem up to the Hadamard bound
+		"""
+		
+		rs, cs = self.shape
+		if rs != cs:
+			raise ValueError("Determinant can only be calculated for Square Matrices")
+		
+		rows, scale = _integerRows(self.rows)
+		bound = _hadamard(rows)
+		
+		residues, moduli = [], []
+		for p in _crtPrimes(bound):
+			det, _ = _eliminateMod([row[:] for row in rows], cs, p)
+			residues.append(det)
+			moduli.append(p)
+		return _ratio(_crtSymmetric(residues, moduli), scale)
+	
+	def solve_modular(self, b):
+		"""
+		Solve `self * x = b` exactly like `solve_exact` by solving modulo several primes
+		The determinant and the numerators `det * x` are reconstructed with the
+		Chinese Remainder Theorem, skipping primes which divide the determinant
+		"""
+		
+		n, cols = self.shape
+		if n != cols:
+			raise ValueError("Exact solve requires a Square Matrix")
+		
+		rhs = _rhsRows(b, n)
+		rows, _ = _integerRows([row + extra for row, extra in zip(self.rows, rhs)])
+		
+		# Every Cramer determinant is bounded by the product of the largest column norms
+		colSq = [sum(row[c] * row[c] for row in rows) for c in range(len(rows[0]))]
+		extraSq = max(colSq[n:], default=0)
+		bound = 1
+		for sq in colSq[:n]:
+			bound *= isqrt(max(sq, extraSq)) + 1
+		
+		# Primes dividing a nonzero determinant only count towards the determinant, keep
+		# drawing until the remaining primes alone recover the numerators
+		dets, nums, moduli, product, goodProduct = [], [], [], 1, 1
+		det = None
+		for p in _primeSource():
+			if product > 2 * bound and det is None:
+				det = _crtSymmetric(dets, moduli)
+				if det == 0:
+					raise ZeroDivisionError("Matrix is Singular")
+			if goodProduct > 2 * bound:
 				break
+			
+			work = [row[:] for row in rows]
+			pdet, rank = _eliminateMod(work, n, p, jordan=True)
+			if rank < n:
+				# Either the Matrix is singular or p divides the determinant
+				dets.append(0)
+				nums.append(None)
+			else:
+				dets.append(pdet)
+				nums.append([[pdet * x % p for x in row[n:]] for row in work])
+				goodProduct *= p
+			moduli.append(p)
+			product *= p
+		
+		if det is None:
+			det = _crtSymmetric(dets, moduli)
+		
+		good = [i for i in range(len(moduli)) if nums[i] is not None]
+		goodMods = [moduli[i] for i in good]
+		sol = []
+		for r in range(n):
+			sol.append([_ratio(_crtSymmetric([nums[i][r][c] for i in good], goodMods), det)
+				for c in range(len(rows[0]) - n)])
+		return _solution(b, sol)
+	
+	def lu(self, zeroVal=0):
+		""" Factor the Matrix as P * A = L * U using partial pivoting """
+		return LUFactorization(self, zeroVal=zeroVal)
+	
+	def nullspace(self):
+		rs, cs = self.shape
+		if self._array is not None:
+			reducedArr, pivots = _rrefArray(self._array)
+			reduced = Matrix.fromArray(reducedArr)
+		elif _isintegral(self.rows):
+			# Float elimination of int data can keep rounding noise as a pivot
+			reducedRows, pivots = _rrefExact(self.rows, cs)
+			reduced = Matrix(*reducedRows)
+		else:
+			aug = AugmentedMatrix(self)
+			pivots = aug.reduce(0)
+			reduced = aug[0]
 		
 		# Get null space basis
 		basis = []
 		for c in range(cs):
 			if c not in pivots:
 				comps = [0] * cs
-				freeVec = aug[0].column(c)
+				freeVec = reduced.column(c)
 				
 				for r in range(len(pivots)):
 					comps[pivots[r]] = freeVec[r]
@@ -257,23 +553,44 @@ class Matrix:
 
 
 class AugmentedMatrix:
+	"""
+	Several Matrices with the same number of rows placed side by side.
+	All blocks share a single flat row-major buffer `data` of width `width`
+	where block `i` occupies columns `offsets[i]` to `offsets[i] + widths[i]`.
+	"""
+	
 	def __init__(self, *matrices):
 		assert len(matrices) > 0, "Augmented Matrix must contain at least one Matrix"
 		
-		self.matrices = list(map(lambda mat: list(map(list, mat.rows)), matrices))
-		self.rows = len(self.matrices[0])
-		
-		for mat in self.matrices:
-			if self.rows != len(mat):
-				raise ValueError(f"Row number mismatch in Augmented Matrix between {self.rows} and {len(mat)}")
+		self.rows = matrices[0].shape[0]
+		self.offsets, self.widths = [], []
+		width = 0
+		for mat in matrices:
+			rs, cs = mat.shape
+			if self.rows != rs:
+				raise ValueError(f"Row number mismatch in Augmented Matrix between {self.rows} and {rs}")
 			
-			cols = len(mat[0])
-			for row in mat:
-				if len(row) != cols:
-					raise ValueError(f"Column number mismatch in Augmented Matrix between {len(row)} and {cols}")
+			self.offsets.append(width)
+			self.widths.append(cs)
+			width += cs
+		self.width = width
+		
+		self.data = [None] * (self.rows * width)
+		for mat, off in zip(matrices, self.offsets):
+			for r, row in enumerate(mat.rows):
+				self.data[r * width + off:r * width + off + len(row)] = row
+		
+		self.pivots = None
+		self.rank = None
+	
+	@property
+	def matrices(self):
+		return [[self.data[r * self.width + off:r * self.width + off + w] for r in range(self.rows)]
+			for off, w in zip(self.offsets, self.widths)]
 	
 	def __getitem__(self, key):
-		return Matrix(*(self.matrices[key]))
+		off, w = self.offsets[key], self.widths[key]
+		return Matrix(*(self.data[r * self.width + off:r * self.width + off + w] for r in range(self.rows)))
 	
 	
 	
@@ -283,10 +600,8 @@ class AugmentedMatrix:
 		elif r2 < 0 or self.rows <= r2:
 			raise IndexError(f"Augmented Matrix Row index out of bounds {r2}")
 		
-		for mat in self.matrices:
-			tmp = mat[r1]
-			mat[r1] = mat[r2]
-			mat[r2] = tmp
+		w = self.width
+		self.data[r1 * w:(r1 + 1) * w], self.data[r2 * w:(r2 + 1) * w] = self.data[r2 * w:(r2 + 1) * w], self.data[r1 * w:(r1 + 1) * w]
 	
 	def add(self, targetRow, sourceRow, scale):
 		if targetRow < 0 or self.rows <= targetRow:
@@ -294,58 +609,954 @@ class AugmentedMatrix:
 		elif sourceRow < 0 or self.rows <= sourceRow:
 			raise IndexError(f"Augmented Matrix Row index out of bounds {sourceRow}")
 		
-		for mat in self.matrices:
-			for c in range(len(mat[0])):
-				mat[targetRow][c] += scale * mat[sourceRow][c]
+		w = self.width
+		src = self.data[sourceRow * w:(sourceRow + 1) * w]
+		self.data[targetRow * w:(targetRow + 1) * w] = map(operator.add, self.data[targetRow * w:(targetRow + 1) * w], [scale * x for x in src])
 	
 	def scale(self, row, scale):
 		if row < 0 or self.rows <= row:
 			raise IndexError(f"Augmented Matrix Row index out of bounds {row}")
 		
-		for mat in self.matrices:
-			for c in range(len(mat[row])):
-				mat[row][c] *= scale
+		w = self.width
+		self.data[row * w:(row + 1) * w] = [x * scale for x in self.data[row * w:(row + 1) * w]]
 	
 	
 	
 	def leading(self, matrixInd, row, zeroVal=0):
-		mat = self.matrices[matrixInd]
 		if row < 0 or self.rows <= row:
 			raise IndexError(f"Augmented Matrix Row index out of bounds {row}")
 		
-		for c in range(len(mat[row])):
-			val = mat[row][c]
+		start = row * self.width + self.offsets[matrixInd]
+		for c in range(self.widths[matrixInd]):
+			val = self.data[start + c]
 			if val != zeroVal:
 				return (c, val)
 		
 		return (None, zeroVal)
 	
-	def reduce(self, targetMat, zeroVal=0):
-		pivotRow = 0
-		cols = len(self.matrices[targetMat][0])
+	def reduce(self, targetMat, zeroVal=0, tol=None):
+		"""
+		Gauss-Jordan elimination bringing block `targetMat` into reduced row echelon form
+		The row operations run directly on the flat buffer skipping zero multipliers.
+		Pivots are the largest magnitude entry for int, float and complex data and
+		the first nonzero entry otherwise.
 		
-		for c in range(cols):
-			p = pivotRow
-			while p < self.rows:
-				leadVal = self.matrices[targetMat][p][c]
-				if leadVal != zeroVal:
-					break
-				
-				p += 1
+		Args:
+			targetMat (int) -- Index of the block to reduce
+			zeroVal -- Zero of the element type
+			tol (float) -- Magnitudes at most `tol` are treated as zero for int, float and
+				complex data (default scales machine epsilon by the size and infinity norm)
+		
+		Returns:
+			list of int -- pivot columns of block `targetMat`, also stored in `pivots` with `rank`
+		"""
+		
+		rows, w, data = self.rows, self.width, self.data
+		off, cols = self.offsets[targetMat], self.widths[targetMat]
+		
+		bymag = all(type(x) in (int, float, complex) for x in data)
+		if tol is None:
+			tol = 0
+			if bymag:
+				# Dividing by the pivots turns int data into floats too, scale by the
+				# infinity norm of the block to allow for growth during the elimination
+				block = (data[r * w + off:r * w + off + cols] for r in range(rows))
+				tol = max(rows, cols) * float_info.epsilon * max((sum(map(abs, row)) for row in block), default=0)
+		
+		pivots, pivotRow = [], 0
+		for c in range(off, off + cols):
+			if pivotRow >= rows:
+				break
 			
-			if p >= self.rows:
+			p = _pivot(data, pivotRow, rows, w, c, bymag, zeroVal, tol)
+			if p is None:
 				# Column contains no viable pivots and so is free
+				if tol > 0:
+					for r in range(pivotRow, rows):
+						data[r * w + c] = zeroVal
 				continue
-			self.scale(p, 1 / leadVal)
-			self.swap(p, pivotRow)
 			
-			for r in range(self.rows):
-				if r != pivotRow:
-					self.add(r, pivotRow, -self.matrices[targetMat][r][c])
+			# Entries left of `c` in the target block are already zero below the used pivots
+			lo = c if off == 0 else 0
+			if p != pivotRow:
+				data[p * w + lo:(p + 1) * w], data[pivotRow * w + lo:(pivotRow + 1) * w] = data[pivotRow * w + lo:(pivotRow + 1) * w], data[p * w + lo:(p + 1) * w]
+			
+			inv = 1 / data[pivotRow * w + c]
+			pivotSeg = [x * inv for x in data[pivotRow * w + lo:(pivotRow + 1) * w]]
+			data[pivotRow * w + lo:(pivotRow + 1) * w] = pivotSeg
+			
+			for r in range(rows):
+				fac = data[r * w + c]
+				if r == pivotRow or fac == zeroVal:
+					continue
+				
+				data[r * w + lo:(r + 1) * w] = map(operator.sub, data[r * w + lo:(r + 1) * w], [fac * x for x in pivotSeg])
+				if bymag:
+					data[r * w + c] = zeroVal  # Clear rounding left by the reciprocal pivot
 			
+			pivots.append(c - off)
 			# Shift pivotRow so rows that are already
 			# used for pivots are not reused
 			pivotRow += 1
+		
+		self.pivots, self.rank = pivots, pivotRow
+		return pivots
+
+
+
+class MatrixPowers:
+	"""
+	Powers of a fixed square Matrix A through the Cayley-Hamilton theorem.
+	`A^k = r(A)` where `r(x) = x^k mod charpoly(x)` has degree below n, so each
+	power costs O(n^2 log k) polynomial work plus one combination of the cached
+	powers `A^0, ..., A^(n-1)`. The squarings `x^(2^i) mod charpoly(x)` are cached
+	and shared by every exponent. Modulo entries are handled over the residues.
+	"""
+	
+	def __init__(self, mat):
+		n, cs = mat.shape
+		if n != cs:
+			raise ValueError("Only Square Matrices can be taken to a power")
+		
+		self.matrix = mat
+		self.size = n
+		
+		rows, self.modulus = _residueRows(mat.rows)
+		self.charpoly = polynomial.Polynomial(*_berkowitz(rows, self.modulus), modulo=self.modulus)
+		
+		self._squares = [polynomial.Polynomial(0, 1, modulo=self.modulus) % self.charpoly]
+		self._basis = None
+	
+	def _element(self, c):
+		return c if self.modulus is None else modulo.Modulo(c, self.modulus)
+	
+	def reduced(self, k):
+		""" Polynomial `x^k mod charpoly(x)` built from the cached squarings """
+		if k < 0:
+			raise ValueError("MatrixPowers only supports non-negative exponents")
+		
+		while len(self._squares) < k.bit_length():
+			sq = self._squares[-1]
+			self._squares.append((sq * sq) % self.charpoly)
+		
+		rem = polynomial.Polynomial(1, modulo=self.modulus)
+		for i in range(k.bit_length()):
+			if (k >> i) & 1:
+				rem = (rem * self._squares[i]) % self.charpoly
+		return rem
+	
+	def _powerBasis(self):
+		if self._basis is None:
+			basis = [identity(self.size)]
+			for _ in range(1, self.size):
+				basis.append(basis[-1] * self.matrix)
+			self._basis = basis
+		return self._basis
+	
+	def power(self, k):
+		""" Return `A^k` for a non-negative integer `k` """
+		rem = self.reduced(k)
+		basis = self._powerBasis()
+		
+		total = None
+		for i in range(self.size):
+			term = basis[i] * self._element(rem[i])
+			total = term if total is None else total + term
+		return total
+	
+	def powers(self, exponents):
+		""" Return `A^k` for every `k` in `exponents` sharing the cached squarings """
+		return [self.power(k) for k in exponents]
+	
+	def apply(self, exponents, vec):
+		"""
+		Return the Vectors `A^k * vec` for every `k` in `exponents`
+		Only the n Krylov Vectors `A^i * vec` are formed, so each exponent
+		costs O(n^2 log k) without any Matrix products.
+		"""
+		
+		krylov = [vec]
+		for _ in range(1, self.size):
+			krylov.append(self.matrix * krylov[-1])
+		
+		results = []
+		for k in exponents:
+			rem = self.reduced(k)
+			total = None
+			for i in range(self.size):
+				term = krylov[i] * self._element(rem[i])
+				total = term if total is None else total + term
+			results.append(total)
+		return results
+
+
+
+class LUFactorization:
+	"""
+	LU Factorization with partial pivoting of a square Matrix such that `P * A = L * U`
+	L (unit lower triangular) and U (upper triangular) are packed into the single
+	flat row-major buffer `lu` with `perm[i]` giving the row of A used as row i.
+	Pivots are chosen by largest magnitude for int, float and complex entries, with
+	magnitudes within rounding of zero treated as singular, and by first nonzero
+	entry for other element types (e.g. Ratio or Modulo).
+	"""
+	
+	def __init__(self, mat, zeroVal=0):
+		n, cs = mat.shape
+		if n != cs:
+			raise ValueError("LU Factorization can only be calculated for Square Matrices")
+		
+		self.size = n
+		self.zeroVal = zeroVal
+		self.lu = [x for row in mat.rows for x in row]
+		self.perm = list(range(n))
+		self.sign = 1
+		self.singular = False
+		
+		lu = self.lu
+		bymag = all(type(x) in (int, float, complex) for x in lu)
+		# Int data is eliminated in floats as well so both get a rounding tolerance,
+		# scaled by the infinity norm to allow for growth during the elimination
+		tol = n * float_info.epsilon * max((sum(map(abs, row)) for row in mat.rows), default=0) if bymag else 0
+		for k in range(n):
+			p = _pivot(lu, k, n, n, k, bymag, zeroVal, tol)
+			if p is None:
+				# Column has no viable pivot
+				self.singular = True
+				continue
+			
+			if p != k:
+				lu[k * n:(k + 1) * n], lu[p * n:(p + 1) * n] = lu[p * n:(p + 1) * n], lu[k * n:(k + 1) * n]
+				self.perm[k], self.perm[p] = self.perm[p], self.perm[k]
+				self.sign = -self.sign
+			
+			pivot = lu[k * n + k]
+			pivotRow = lu[k * n + k + 1:(k + 1) * n]
+			for r in range(k + 1, n):
+				fac = lu[r * n + k]
+				if _iszero(fac, zeroVal):
+					continue
+				
+				fac = fac / pivot
+				lu[r * n + k] = fac
+				lu[r * n + k + 1:(r + 1) * n] = map(operator.sub, lu[r * n + k + 1:(r + 1) * n], [fac * x for x in pivotRow])
+	
+	
+	
+	@property
+	def L(self):
+		n = self.size
+		return Matrix(*(tuple(self.lu[r * n + c] if c < r else (1 if c == r else self.zeroVal) for c in range(n)) for r in range(n)))
+	
+	@property
+	def U(self):
+		n = self.size
+		return Matrix(*(tuple(self.lu[r * n + c] if c >= r else self.zeroVal for c in range(n)) for r in range(n)))
+	
+	@property
+	def P(self):
+		n = self.size
+		return Matrix(*(tuple(1 if c == self.perm[r] else self.zeroVal for c in range(n)) for r in range(n)))
+	
+	
+	
+	def _solve(self, b):
+		""" Solve using the packed factors where `b` is a list of length `size` """
+		if self.singular:
+			raise ZeroDivisionError("Matrix is Singular")
+		
+		n, lu = self.size, self.lu
+		y = [b[p] for p in self.perm]
+		
+		# Forward substitution with unit diagonal L
+		for i in range(1, n):
+			y[i] = y[i] - sum(map(operator.mul, lu[i * n:i * n + i], y[:i]))
+		
+		# Back substitution with U
+		for i in range(n - 1, -1, -1):
+			y[i] = (y[i] - sum(map(operator.mul, lu[i * n + i + 1:(i + 1) * n], y[i + 1:]))) / lu[i * n + i]
+		return y
+	
+	def solve(self, b):
+		""" Solve A * x = b for the Vector x """
+		comps = b.components if isinstance(b, vector.Vector) else tuple(b)
+		if len(comps) != self.size:
+			raise ValueError(f"Dimension mismatch between Matrix {self.size} and Vector {len(comps)}")
+		return vector.Vector(*self._solve(comps))
+	
+	def solve_many(self, B):
+		"""
+		Solve A * X = B for many right-hand sides
+		If `B` is a Matrix its columns are the right-hand sides and a Matrix is returned
+		otherwise `B` is an iterable of Vectors and a list of Vectors is returned
+		"""
+		
+		if isinstance(B, Matrix):
+			rs, cs = B.shape
+			if rs != self.size:
+				raise ValueError(f"Matrix Row mismatch between {self.size} and {rs}")
+			return Matrix(*zip(*(self._solve(B.column(c).components) for c in range(cs))))
+		else:
+			return [self.solve(b) for b in B]
+	
+	def det(self):
+		if self.singular:
+			return self.zeroVal
+		
+		n, det = self.size, self.sign
+		for i in range(n):
+			det = det * self.lu[i * n + i]
+		return det
+	
+	def logdet(self):
+		"""
+		Logarithm of the absolute value of the determinant along with its sign
+		
+		Returns:
+			tuple -- (sign, logabsdet) with sign 0 and logabsdet -inf for singular matrices
+		"""
+		
+		if self.singular:
+			return (0, float('-inf'))
+		
+		n, sign, total = self.size, self.sign, 0.0
+		for i in range(n):
+			d = self.lu[i * n + i]
+			if d < 0:
+				sign = -sign
+			total += log(abs(d))
+		return (sign, total)
+	
+	def inverse(self):
+		n = self.size
+		cols = [self._solve([1 if r == c else self.zeroVal for r in range(n)]) for c in range(n)]
+		return Matrix(*zip(*cols))
+
+
+
+def _isnumeric(vals, requireFloat=True):
+	""" Whether `vals` are plain ints and floats containing at least one float if `requireFloat` """
+	hasFloat = False
+	for x in vals:
+		if isinstance(x, float):
+			hasFloat = True
+		elif not isinstance(x, int) or isinstance(x, bool):
+			return False
+	return hasFloat or not requireFloat
+
+def _toArray(rows, dtype):
+	"""
+	Contiguous NumPy array for `rows` when `dtype` is given or the content is
+	homogeneous float data, otherwise None to keep the generic tuple backend.
+	Integer matrices only use NumPy with an explicit `dtype` so that Python's
+	arbitrary precision integer arithmetic is preserved by default.
+	"""
+	
+	if dtype is None:
+		if np is None or not _isnumeric(x for row in rows for x in row):
+			return None
+		dtype = np.float64
+	elif np is None:
+		raise ImportError("NumPy is required to build a Matrix with an explicit dtype")
+	
+	return np.array(rows, dtype=dtype)
+
+def _rrefArray(arr, tol=None):
+	"""
+	Reduced row echelon form of a NumPy array using partial pivoting
+	Entries at most `tol` (default machine epsilon scaled by the size and infinity norm)
+	are treated as zero
+	
+	Returns:
+		tuple -- (reduced array, list of pivot columns)
+	"""
+	
+	a = np.array(arr, dtype=np.result_type(arr.dtype, np.float64))
+	rs, cs = a.shape
+	if tol is None:
+		tol = max(rs, cs) * np.finfo(np.float64).eps * (np.abs(a).sum(axis=1).max() if a.size else 0)
+	
+	pivots, r = [], 0
+	for c in range(cs):
+		if r >= rs:
+			break
+		
+		p = r + int(np.argmax(np.abs(a[r:, c])))
+		if abs(a[p, c]) <= tol:
+			a[r:, c] = 0
+			continue
+		
+		if p != r:
+			a[[r, p]] = a[[p, r]]
+		a[r] /= a[r, c]
+		
+		facs = a[:, c].copy()
+		facs[r] = 0
+		a -= np.outer(facs, a[r])
+		
+		pivots.append(c)
+		r += 1
+	return a, pivots
+
+
+
+def _pivot(buf, first, rows, stride, col, bymag, zeroVal, tol=0):
+	"""
+	Row in `first` to `rows` to pivot on within column `col` of the flat buffer `buf`
+	Chooses the largest magnitude if `bymag` and otherwise the first nonzero entry
+	
+	Returns:
+		int -- pivot row or None when the column has no entry above `tol`
+	"""
+	
+	if bymag:
+		p = max(range(first, rows), key=lambda r: abs(buf[r * stride + col]))
+		val = buf[p * stride + col]
+		return None if val == zeroVal or abs(val) <= tol else p
+	
+	for p in range(first, rows):
+		if not _iszero(buf[p * stride + col], zeroVal):
+			return p
+	return None
+
+def _iszero(x, zeroVal):
+	""" Compare with `zeroVal`, Modulo has no equality so its residue is tested instead """
+	if isinstance(x, modulo.Modulo):
+		return x.residue % x.modulo == 0
+	return x == zeroVal
+
+# Tile size of the blocked multiplication kernel
+BLOCK_SIZE = 64
+# Smallest dimension at which multiplication recurses with Strassen-Winograd
+STRASSEN_THRESHOLD = 128
+
+def _dot(a, b):
+	""" Dot product of two equal length sequences without assuming an additive identity """
+	return sum(map(operator.mul, a[1:], b[1:]), a[0] * b[0])
+
+def _madd(a, b):
+	return [list(map(operator.add, r1, r2)) for r1, r2 in zip(a, b)]
+
+def _msub(a, b):
+	return [list(map(operator.sub, r1, r2)) for r1, r2 in zip(a, b)]
+
+def _blockmul(a, b, block):
+	""" Multiply lists of rows by tiling over the rows of `a` and the columns of `b` """
+	cols = list(zip(*b))  # Transpose once so each kernel reads two contiguous tuples
+	out = [[None] * len(cols) for _ in range(len(a))]
+	
+	for r0 in range(0, len(a), block):
+		rowBlock = a[r0:r0 + block]
+		for c0 in range(0, len(cols), block):
+			colBlock = cols[c0:c0 + block]
+			for r, row in enumerate(rowBlock, r0):
+				out[r][c0:c0 + len(colBlock)] = [_dot(row, col) for col in colBlock]
+	return out
+
+def _strassen(a, b, block, threshold):
+	""" Strassen-Winograd multiplication of lists of rows padding odd dimensions with zero """
+	n, k, m = len(a), len(b), len(b[0])
+	if min(n, k, m) < threshold:
+		return _blockmul(a, b, block)
+	
+	zeroA, zeroB = a[0][0] - a[0][0], b[0][0] - b[0][0]
+	if n % 2 or k % 2:
+		a = [list(row) + [zeroA] * (k % 2) for row in a] + [[zeroA] * (k + k % 2)] * (n % 2)
+	if k % 2 or m % 2:
+		b = [list(row) + [zeroB] * (m % 2) for row in b] + [[zeroB] * (m + m % 2)] * (k % 2)
+	
+	h, kh, mh = (n + 1) // 2, (k + 1) // 2, (m + 1) // 2
+	A11, A12 = [row[:kh] for row in a[:h]], [row[kh:] for row in a[:h]]
+	A21, A22 = [row[:kh] for row in a[h:]], [row[kh:] for row in a[h:]]
+	B11, B12 = [row[:mh] for row in b[:kh]], [row[mh:] for row in b[:kh]]
+	B21, B22 = [row[:mh] for row in b[kh:]], [row[mh:] for row in b[kh:]]
+	
+	S1 = _madd(A21, A22)
+	S2 = _msub(S1, A11)
+	S3 = _msub(A11, A21)
+	S4 = _msub(A12, S2)
+	T1 = _msub(B12, B11)
+	T2 = _msub(B22, T1)
+	T3 = _msub(B22, B12)
+	T4 = _msub(T2, B21)
+	
+	mul = lambda x, y: _strassen(x, y, block, threshold)
+	M1 = mul(A11, B11)
+	U2 = _madd(M1, mul(S2, T2))
+	U3 = _madd(U2, mul(S3, T3))
+	M5 = mul(S1, T1)
+	
+	C11 = _madd(M1, mul(A12, B21))
+	C12 = _madd(_madd(U2, M5), mul(S4, B22))
+	C21 = _msub(U3, mul(A22, T4))
+	C22 = _madd(U3, M5)
+	
+	top = [r1 + r2 for r1, r2 in zip(C11, C12)]
+	bottom = [r1 + r2 for r1, r2 in zip(C21, C22)]
+	return [row[:m] for row in (top + bottom)[:n]]
+
+def multiply(a, b, block=None, threshold=None):
+	"""
+	Multiply two matrices given as sequences of rows
+	Uses a tiled kernel over the transpose of `b` and switches to Strassen-Winograd
+	once every dimension reaches `threshold`. Only ring operations are used so
+	generic elements such as Ratio, Modulo and Polynomial are supported.
+	
+	Args:
+		a, b (sequence of sequences) -- Rows of the two factors
+		block (int) -- Tile size (default `BLOCK_SIZE`)
+		threshold (int) -- Strassen cutoff (default `STRASSEN_THRESHOLD`)
+	
+	Returns:
+		list of lists -- rows of the product
+	"""
+	
+	block = BLOCK_SIZE if block is None else block
+	threshold = STRASSEN_THRESHOLD if threshold is None else threshold
+	if len(a[0]) != len(b):
+		raise ValueError(f"Matrix Row-Column mismatch between {len(a[0])} and {len(b)}")
+	
+	return _strassen(a, b, block, max(threshold, 2))
+
+
+
+def _residueRows(rows):
+	"""
+	Rows as residues when every entry is a Modulo of one modulus
+	
+	Returns:
+		tuple -- (list of rows, modulus or None)
+	"""
+	
+	first = rows[0][0]
+	if isinstance(first, modulo.Modulo) and all(isinstance(x, modulo.Modulo) and x.modulo == first.modulo for row in rows for x in row):
+		return [[x.residue for x in row] for row in rows], first.modulo
+	return [list(row) for row in rows], None
+
+def _berkowitz(rows, mod=None):
+	"""
+	Coefficients (constant first) of the characteristic polynomial det(xI - A)
+	Berkowitz's algorithm is division free so it works over any commutative ring
+	and reduces modulo `mod` when given.
+	
+	Returns:
+		list -- n + 1 coefficients of the monic characteristic polynomial
+	"""
+	
+	n = len(rows)
+	reduce = (lambda x: x % mod) if mod is not None else (lambda x: x)
+	vect = [1, reduce(-rows[0][0])]  # Highest power first
+	for r in range(1, n):
+		R = rows[r][:r]
+		S = [rows[i][r] for i in range(r)]
+		
+		# Toeplitz column (1, -a, -R S, -R C S, ..., -R C^(r-1) S)
+		toep = [1, reduce(-rows[r][r])]
+		w = S
+		for _ in range(r):
+			toep.append(reduce(-_dot(R, w)))
+			w = [reduce(_dot(rows[i][:r], w)) for i in range(r)]
+		
+		vect = [reduce(sum(toep[i - j] * vect[j] for j in range(max(0, i - len(toep) + 1), min(i, r) + 1)))
+			for i in range(r + 2)]
+	return vect[::-1]
+
+def _hessenberg(a, mod=None):
+	"""
+	Reduce the square list of rows `a` in place to upper Hessenberg form using
+	elementary similarity transforms with pivoting. Pivots on the largest magnitude
+	for floats or on the first nonzero residue when working modulo the prime `mod`.
+	"""
+	
+	n = len(a)
+	if mod is not None:
+		for row in a:
+			row[:] = [x % mod for x in row]
+	
+	for m in range(1, n - 1):
+		if mod is None:
+			piv = max(range(m, n), key=lambda j: abs(a[j][m - 1]))
+		else:
+			piv = next((j for j in range(m, n) if a[j][m - 1] != 0), m)
+		
+		if piv != m:
+			a[piv], a[m] = a[m], a[piv]
+			for row in a:
+				row[piv], row[m] = row[m], row[piv]
+		
+		x = a[m][m - 1]
+		if x == 0:
+			continue
+		inv = 1 / x if mod is None else modulo.Modulo.invert(x, mod)
+		
+		for i in range(m + 1, n):
+			y = a[i][m - 1]
+			if y == 0:
+				continue
+			
+			y = y * inv if mod is None else y * inv % mod
+			a[i][m - 1] = 0
+			if mod is None:
+				a[i][m:] = [u - y * v for u, v in zip(a[i][m:], a[m][m:])]
+				for row in a:
+					row[m] += y * row[i]
+			else:
+				a[i][m:] = [(u - y * v) % mod for u, v in zip(a[i][m:], a[m][m:])]
+				for row in a:
+					row[m] = (row[m] + y * row[i]) % mod
+	return a
+
+def _hessenbergCharpoly(h, mod=None):
+	"""
+	Coefficients (constant first) of det(xI - H) for an upper Hessenberg H
+	using the recurrence on its leading principal submatrices in O(n^3)
+	"""
+	
+	n = len(h)
+	polys = [[1]]
+	for m in range(1, n + 1):
+		prev = polys[m - 1]
+		p = [0] + prev
+		diag = h[m - 1][m - 1]
+		for j, c in enumerate(prev):
+			p[j] -= diag * c
+		
+		t = 1
+		for i in range(1, m):
+			t = t * h[m - i][m - i - 1]
+			if mod is not None:
+				t %= mod
+			if t == 0:
+				break
+			
+			coef = t * h[m - i - 1][m - 1]
+			if coef != 0:
+				for j, c in enumerate(polys[m - i - 1]):
+					p[j] -= coef * c
+		
+		polys.append(p if mod is None else [c % mod for c in p])
+	return polys[n]
+
+def _hessenbergEigenvalues(h):
+	"""
+	Eigenvalues of a real upper Hessenberg list of rows by the
+	Francis double shift QR algorithm with deflation (destroys `h`)
+	"""
+	
+	n = len(h)
+	a = [[0.0] * (n + 1)] + [[0.0] + row for row in h]  # 1-indexed working copy
+	wr, wi = [0.0] * (n + 1), [0.0] * (n + 1)
+	sign = lambda mag, ref: abs(mag) if ref >= 0 else -abs(mag)
+	
+	anorm = sum(abs(a[i][j]) for i in range(1, n + 1) for j in range(max(i - 1, 1), n + 1))
+	nn, t = n, 0.0
+	while nn >= 1:
+		its = 0
+		while True:
+			# Look for a single small subdiagonal element to split the matrix
+			l = nn
+			while l >= 2:
+				s = abs(a[l - 1][l - 1]) + abs(a[l][l])
+				if s == 0:
+					s = anorm
+				if abs(a[l][l - 1]) + s == s:
+					a[l][l - 1] = 0.0
+					break
+				l -= 1
+			
+			x = a[nn][nn]
+			if l == nn:
+				# One root found
+				wr[nn], wi[nn] = x + t, 0.0
+				nn -= 1
+			else:
+				y = a[nn - 1][nn - 1]
+				w = a[nn][nn - 1] * a[nn - 1][nn]
+				if l == nn - 1:
+					# Two roots found
+					p = 0.5 * (y - x)
+					q = p * p + w
+					z = sqrt(abs(q))
+					x += t
+					if q >= 0:
+						z = p + sign(z, p)
+						wr[nn - 1] = wr[nn] = x + z
+						if z != 0:
+							wr[nn] = x - w / z
+						wi[nn - 1] = wi[nn] = 0.0
+					else:
+						wr[nn - 1] = wr[nn] = x + p
+						wi[nn - 1], wi[nn] = -z, z
+					nn -= 2
+				else:
+					if its == 60:
+						raise ArithmeticError("Too many iterations computing eigenvalues")
+					if its == 10 or its == 20:
+						# Exceptional shift
+						t += x
+						for i in range(1, nn + 1):
+							a[i][i] -= x
+						s = abs(a[nn][nn - 1]) + abs(a[nn - 1][nn - 2])
+						y = x = 0.75 * s
+						w = -0.4375 * s * s
+					its += 1
+					
+					# Form shift and look for two consecutive small subdiagonal elements
+					m = nn - 2
+					while m >= l:
+						z = a[m][m]
+						r, s = x - z, y - z
+						p = (r * s - w) / a[m + 1][m] + a[m][m + 1]
+						q = a[m + 1][m + 1] - z - r - s
+						r = a[m + 2][m + 1]
+						s = abs(p) + abs(q) + abs(r)
+						p, q, r = p / s, q / s, r / s
+						if m == l:
+							break
+						u = abs(a[m][m - 1]) * (abs(q) + abs(r))
+						v = abs(p) * (abs(a[m - 1][m - 1]) + abs(z) + abs(a[m + 1][m + 1]))
+						if u + v == v:
+							break
+						m -= 1
+					
+					for i in range(m + 2, nn + 1):
+						a[i][i - 2] = 0.0
+						if i != m + 2:
+							a[i][i - 3] = 0.0
+					
+					# Double QR step on rows l to nn and columns m to nn
+					for k in range(m, nn):
+						if k != m:
+							p, q = a[k][k - 1], a[k + 1][k - 1]
+							r = a[k + 2][k - 1] if k != nn - 1 else 0.0
+							x = abs(p) + abs(q) + abs(r)
+							if x != 0:
+								p, q, r = p / x, q / x, r / x
+						
+						s = sign(sqrt(p * p + q * q + r * r), p)
+						if s == 0:
+							continue
+						
+						if k == m:
+							if l != m:
+								a[k][k - 1] = -a[k][k - 1]
+						else:
+							a[k][k - 1] = -s * x
+						p += s
+						x, y, z = p / s, q / s, r / s
+						q, r = q / p, r / p
+						
+						for j in range(k, nn + 1):
+							p = a[k][j] + q * a[k + 1][j]
+							if k != nn - 1:
+								p += r * a[k + 2][j]
+								a[k + 2][j] -= p * z
+							a[k + 1][j] -= p * y
+							a[k][j] -= p * x
+						
+						for i in range(l, min(nn, k + 3) + 1):
+							p = x * a[i][k] + y * a[i][k + 1]
+							if k != nn - 1:
+								p += z * a[i][k + 2]
+								a[i][k + 2] -= p * r
+							a[i][k + 1] -= p * q
+							a[i][k] -= p
+			
+			if l >= nn - 1:
+				break
+	
+	return [complex(wr[i], wi[i]) if wi[i] != 0 else wr[i] for i in range(1, n + 1)]
+
+def _ratio(num, den):
+	""" Exact quotient as an int when possible and a Ratio otherwise """
+	if den < 0:
+		num, den = -num, -den
+	if num % den == 0:
+		return num // den
+	return rational.Ratio(num, den)
+
+def _integerRows(rows):
+	"""
+	Scale each row of int and Ratio entries by the lcm of its denominators
+	
+	Returns:
+		tuple -- (list of int rows, product of the row scales)
+	"""
+	
+	intRows, total = [], 1
+	for row in rows:
+		fracs = []
+		for x in row:
+			if isinstance(x, int):
+				fracs.append((x, 1))
+			elif isinstance(x, rational.Ratio):
+				num, den = (-x.num, -x.den) if x.den < 0 else (x.num, x.den)
+				fracs.append((num, den))
+			else:
+				raise TypeError(f"Exact elimination requires int or Ratio entries not {type(x).__name__}")
+		
+		scale = 1
+		for _, den in fracs:
+			scale = scale * den // gcd(scale, den)
+		intRows.append([num * (scale // den) for num, den in fracs])
+		total *= scale
+	return intRows, total
+
+def _rhsRows(b, n):
+	""" Rows of the right-hand side as lists of entries """
+	if isinstance(b, vector.Vector):
+		if len(b) != n:
+			raise ValueError(f"Dimension mismatch between Matrix {n} and Vector {len(b)}")
+		return [(x,) for x in b.components]
+	elif isinstance(b, Matrix):
+		if b.shape[0] != n:
+			raise ValueError(f"Matrix Row mismatch between {n} and {b.shape[0]}")
+		return list(b.rows)
+	else:
+		raise TypeError("Right-hand side must be a Vector or Matrix")
+
+def _solution(b, sol):
+	if isinstance(b, vector.Vector):
+		return vector.Vector(*(row[0] for row in sol))
+	return Matrix(*sol)
+
+def _isintegral(rows):
+	return all(type(x) is int for row in rows for x in row)
+
+def _rrefExact(rows, cols):
+	"""
+	Reduced row echelon form of int or Ratio rows by Bareiss elimination
+	
+	Returns:
+		tuple -- (list of reduced rows, list of pivot columns)
+	"""
+	
+	rows, _ = _integerRows(rows)
+	pivots, _, last = _bareiss(rows, cols, jordan=True)
+	return [[_ratio(x, last) for x in row] for row in rows], pivots
+
+def _bareiss(rows, cols, jordan=False):
+	"""
+	Bareiss fraction-free elimination on the first `cols` columns of int rows in place
+	Every division is exact so entries stay integers of controlled size.
+	With `jordan` rows above each pivot are also cleared leaving `last` times the
+	reduced row echelon form.
+	
+	Returns:
+		tuple -- (pivot columns, sign of the row permutation, last pivot value)
+	"""
+	
+	n = len(rows)
+	prev, sign, pivots, r = 1, 1, [], 0
+	for c in range(cols):
+		if r >= n:
+			break
+		
+		p = next((i for i in range(r, n) if rows[i][c] != 0), None)
+		if p is None:
+			continue
+		
+		if p != r:
+			rows[p], rows[r] = rows[r], rows[p]
+			sign = -sign
+		
+		prow = rows[r]
+		pv = prow[c]
+		lo = 0 if jordan else c
+		for i in range(0 if jordan else r + 1, n):
+			if i == r:
+				continue
+			
+			row, f = rows[i], rows[i][c]
+			if f == 0:
+				rows[i][lo:] = [pv * x // prev for x in row[lo:]]
+			else:
+				rows[i][lo:] = [(pv * x - f * y) // prev for x, y in zip(row[lo:], prow[lo:])]
+		
+		pivots.append(c)
+		prev = pv
+		r += 1
+	
+	return pivots, sign, prev
+
+def _eliminateMod(rows, cols, p, jordan=False):
+	"""
+	Gaussian elimination of int rows modulo the prime `p` in place
+	With `jordan` the first `cols` columns are brought to reduced row echelon form.
+	
+	Returns:
+		tuple -- (determinant modulo p of the leading square block, rank)
+	"""
+	
+	n = len(rows)
+	det, r = 1, 0
+	for row in rows:
+		row[:] = [x % p for x in row]
+	
+	for c in range(cols):
+		if r >= n:
+			break
+		
+		piv = next((i for i in range(r, n) if rows[i][c] != 0), None)
+		if piv is None:
+			det = 0
+			continue
+		
+		if piv != r:
+			rows[piv], rows[r] = rows[r], rows[piv]
+			det = -det
+		
+		pv = rows[r][c]
+		det = det * pv % p
+		inv = modulo.Modulo.invert(pv, p)
+		prow = rows[r] = [x * inv % p for x in rows[r]]
+		
+		for i in range(0 if jordan else r + 1, n):
+			f = rows[i][c]
+			if i == r or f == 0:
+				continue
+			rows[i] = [(x - f * y) % p for x, y in zip(rows[i], prow)]
+		r += 1
+	
+	return (det % p if r == cols else 0), r
+
+def _hadamard(rows):
+	""" Hadamard bound on the absolute value of the determinant of int rows """
+	bound = 1
+	for row in rows:
+		bound *= isqrt(sum(x * x for x in row)) + 1
+	return bound
+
+# Primes below 2^31 used for multi-modular elimination, found lazily
+_CRT_PRIMES = []
+
+def _primeSource():
+	""" Yield the descending primes below 2^31, caching those already found """
+	yield from _CRT_PRIMES
+	cand = _CRT_PRIMES[-1] - 2 if _CRT_PRIMES else (1 << 31) - 1
+	while True:
+		if primes.isprime(cand):
+			_CRT_PRIMES.append(cand)
+			yield cand
+		cand -= 2
+
+def _crtPrimes(bound):
+	""" Primes whose product exceeds twice `bound` so symmetric residues are recovered """
+	product = 1
+	for p in _primeSource():
+		if product > 2 * bound:
+			return
+		product *= p
+		yield p
+
+def _crtSymmetric(residues, moduli):
+	""" Combine residues with the Chinese Remainder Theorem into the symmetric range """
+	x, m = 0, 1
+	for r, p in zip(residues, moduli):
+		t = (r - x) * modulo.Modulo.invert(m, p) % p
+		x += m * t
+		m *= p
+	return x - m if 2 * x > m else x
 
 
 
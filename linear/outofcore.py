@@ -0,0 +1,219 @@
+import struct
+
+from . import vector
+from . import matrix
+
+try:
+	import numpy as np
+except ImportError:  # NumPy is optional but required for memory mapped matrices
+	np = None
+
+# File layout: fixed size little endian header followed by the raw row-major data
+#   magic (8s) | version (H) | layout (H) | rows (Q) | cols (Q) | dtype (16s) | padding
+MAGIC = b'XMATRIX\x00'
+VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct('<8sHHQQ16s')
+LAYOUTS = {'row': 0, 'column': 1}
+
+# Default tile edge for the out-of-core algorithms
+TILE_SIZE = 1024
+
+def _requireNumpy():
+	if np is None:
+		raise ImportError("NumPy is required for memory mapped matrices")
+
+def _writeHeader(f, shape, dtype, layout='row'):
+	dtype = np.dtype(dtype)
+	if dtype.hasobject:
+		raise TypeError("Memory mapped matrices require a fixed size numeric dtype")
+	
+	header = _HEADER.pack(MAGIC, VERSION, LAYOUTS[layout], shape[0], shape[1], dtype.str.encode('ascii'))
+	f.write(header.ljust(HEADER_SIZE, b'\x00'))
+
+def _readHeader(path):
+	with open(path, 'rb') as f:
+		raw = f.read(HEADER_SIZE)
+	if len(raw) < HEADER_SIZE:
+		raise ValueError(f"File {path} is too short to be a matrix file")
+	
+	magic, version, layout, rows, cols, dtype = _HEADER.unpack(raw[:_HEADER.size])
+	if magic != MAGIC:
+		raise ValueError(f"File {path} is not a matrix file")
+	elif version != VERSION:
+		raise ValueError(f"Unsupported matrix file version {version}")
+	
+	layout = {v: k for k, v in LAYOUTS.items()}.get(layout)
+	if layout is None:
+		raise ValueError(f"Unknown matrix file layout in {path}")
+	return (rows, cols), np.dtype(dtype.rstrip(b'\x00').decode('ascii')), layout
+
+def _defaultDtype(rows):
+	""" int64 for int data and float64 for other real data """
+	vals = [x for row in rows for x in row]
+	if not all(isinstance(x, (int, float)) for x in vals):
+		raise TypeError("Only int and float Matrices can be saved to a matrix file")
+	elif any(type(x) is int and not -2 ** 63 <= x < 2 ** 63 for x in vals):
+		raise OverflowError("Ints outside the int64 range need an explicit dtype to be saved")
+	return np.int64 if all(type(x) is int for x in vals) else np.float64
+
+def save(mat, path, dtype=None):
+	"""
+	Write a Matrix to `path` in the binary matrix format
+	Rows are streamed to the file one at a time
+	
+	Args:
+		mat (Matrix) -- Matrix to store
+		path (str) -- Destination file
+		dtype -- NumPy dtype of the stored data (default from the contents)
+	"""
+	
+	_requireNumpy()
+	if dtype is None:
+		dtype = mat.array.dtype if mat.array is not None else _defaultDtype(mat.rows)
+	
+	with open(path, 'wb') as f:
+		_writeHeader(f, mat.shape, dtype)
+		if mat.array is not None:
+			f.write(np.ascontiguousarray(mat.array, dtype=dtype).tobytes())
+		else:
+			for row in mat.rows:
+				f.write(np.asarray(row, dtype=dtype).tobytes())
+
+
+
+class MappedMatrix:
+	"""
+	Matrix file opened through `numpy.memmap` so only the pages
+	that are touched are read into memory
+	"""
+	
+	def __init__(self, path, mode='r'):
+		_requireNumpy()
+		self.path = path
+		shape, self.dtype, self.layout = _readHeader(path)
+		self.shape = shape
+		
+		mapShape = shape if self.layout == 'row' else shape[::-1]
+		self.data = np.memmap(path, dtype=self.dtype, mode=mode, offset=HEADER_SIZE, shape=mapShape)
+		if self.layout == 'column':
+			self.data = self.data.T
+	
+	@staticmethod
+	def create(path, shape, dtype='float64'):
+		""" Create a zero filled matrix file of `shape` and open it for writing """
+		_requireNumpy()
+		dtype = np.dtype(dtype)
+		with open(path, 'wb') as f:
+			_writeHeader(f, shape, dtype)
+			f.truncate(HEADER_SIZE + shape[0] * shape[1] * dtype.itemsize)
+		return MappedMatrix(path, mode='r+')
+	
+	def flush(self):
+		self.data.flush()
+	
+	def close(self):
+		""" Flush any changes and release the mapping """
+		if self.data is not None:
+			if isinstance(self.data, np.memmap) and self.data.mode != 'r':
+				self.data.flush()
+			self.data = None
+	
+	def __enter__(self):
+		return self
+	
+	def __exit__(self, *exc):
+		self.close()
+	
+	
+	
+	def __getitem__(self, key):
+		return self.data[key[0], key[1]].item()
+	
+	def row(self, key):
+		return vector.Vector(*self.data[key].tolist())
+	
+	def column(self, key):
+		return vector.Vector(*self.data[:, key].tolist())
+	
+	def toMatrix(self):
+		"""
+		Matrix over the mapped data
+		Row layout files are wrapped without being read, only the pages that are touched
+		are loaded. Column layout files are copied into memory in row-major order.
+		"""
+		return matrix.Matrix.fromArray(self.data)
+	
+	def __repr__(self):
+		return f"MappedMatrix({self.path!r}, shape={self.shape}, dtype={self.dtype})"
+
+
+
+def matmul(a, b, path, tile=None, dtype=None):
+	"""
+	Out-of-core product of two MappedMatrices written to the new file `path`
+	At most three `tile` by `tile` blocks (one of each factor and an accumulator)
+	are resident at any time.
+	
+	Returns:
+		MappedMatrix -- the product opened for reading and writing
+	"""
+	
+	tile = TILE_SIZE if tile is None else tile
+	(n, k), (kb, m) = a.shape, b.shape
+	if k != kb:
+		raise ValueError(f"Matrix Row-Column mismatch between {k} and {kb}")
+	
+	dtype = np.result_type(a.dtype, b.dtype) if dtype is None else dtype
+	out = MappedMatrix.create(path, (n, m), dtype)
+	for r0 in range(0, n, tile):
+		r1 = min(r0 + tile, n)
+		for c0 in range(0, m, tile):
+			c1 = min(c0 + tile, m)
+			acc = np.zeros((r1 - r0, c1 - c0), dtype=dtype)
+			for k0 in range(0, k, tile):
+				k1 = min(k0 + tile, k)
+				acc += np.asarray(a.data[r0:r1, k0:k1]) @ np.asarray(b.data[k0:k1, c0:c1])
+			out.data[r0:r1, c0:c1] = acc
+		out.flush()
+	return out
+
+def transpose(a, path, tile=None):
+	"""
+	Out-of-core transpose of a MappedMatrix written to the new file `path`
+	copying one `tile` by `tile` block at a time
+	
+	Returns:
+		MappedMatrix -- the transpose opened for reading and writing
+	"""
+	
+	tile = TILE_SIZE if tile is None else tile
+	n, m = a.shape
+	out = MappedMatrix.create(path, (m, n), a.dtype)
+	for r0 in range(0, n, tile):
+		r1 = min(r0 + tile, n)
+		for c0 in range(0, m, tile):
+			c1 = min(c0 + tile, m)
+			out.data[c0:c1, r0:r1] = np.asarray(a.data[r0:r1, c0:c1]).T
+		out.flush()
+	return out
+
+def matvec(a, vec, tile=None):
+	"""
+	Multiply a MappedMatrix by a Vector streaming bands of `tile` rows
+	
+	Returns:
+		Vector -- the product kept in memory
+	"""
+	
+	tile = TILE_SIZE if tile is None else tile
+	n, m = a.shape
+	if len(vec) != m:
+		raise ValueError(f"Matrix Column mismatch with Vector between {m} and {len(vec)}")
+	
+	x = np.asarray(vec.components)
+	out = np.empty(n, dtype=np.result_type(a.dtype, x.dtype))
+	for r0 in range(0, n, tile):
+		r1 = min(r0 + tile, n)
+		out[r0:r1] = np.asarray(a.data[r0:r1]) @ x
+	return vector.Vector(*out.tolist())
@@ -0,0 +1,125 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from array import array
+import operator
+import os
+
+from . import matrix
+
+try:
+	import numpy as np
+except ImportError:  # NumPy is optional and only speeds up the float kernel
+	np = None
+
+# Operands of the current worker process set by the pool initializer
+_state = {}
+
+def _initShared(names, shape):
+	n, k, m = shape
+	# Workers share the parent's resource tracker so attaching does not take ownership
+	blocks = [shared_memory.SharedMemory(name=name) for name in names]
+	_state['blocks'] = blocks  # Keep the mappings alive for the life of the worker
+	_state['shape'] = shape
+	
+	if np is not None:
+		_state['a'] = np.ndarray((n, k), dtype=np.float64, buffer=blocks[0].buf)
+		_state['bt'] = np.ndarray((m, k), dtype=np.float64, buffer=blocks[1].buf)
+		_state['c'] = np.ndarray((n, m), dtype=np.float64, buffer=blocks[2].buf)
+	else:
+		_state['a'], _state['bt'], _state['c'] = (blk.buf.cast('d') for blk in blocks)
+
+def _sharedTile(r0, r1, c0, c1):
+	""" Write the tile of the product in rows r0:r1 and columns c0:c1 into shared memory """
+	n, k, m = _state['shape']
+	a, bt, c = _state['a'], _state['bt'], _state['c']
+	if np is not None:
+		c[r0:r1, c0:c1] = a[r0:r1] @ bt[c0:c1].T
+		return
+	
+	cols = [bt[j * k:(j + 1) * k] for j in range(c0, c1)]
+	for r in range(r0, r1):
+		row = a[r * k:(r + 1) * k]
+		c[r * m + c0:r * m + c1] = array('d', (sum(map(operator.mul, row, col)) for col in cols))
+
+def _initGeneric(rows, cols):
+	_state['rows'] = rows
+	_state['cols'] = cols
+
+def _genericTile(r0, r1, c0, c1):
+	""" Return the tile of the product in rows r0:r1 and columns c0:c1 """
+	rows, cols = _state['rows'], _state['cols']
+	return r0, c0, [[matrix._dot(row, col) for col in cols[c0:c1]] for row in rows[r0:r1]]
+
+def _tiles(n, m, block):
+	for r0 in range(0, n, block):
+		for c0 in range(0, m, block):
+			yield r0, min(r0 + block, n), c0, min(c0 + block, m)
+
+def multiply(a, b, workers=None, block=None):
+	"""
+	Multiply two Matrices splitting the product into tiles computed in parallel
+	The tiles are dispatched to a `ProcessPoolExecutor`. Float operands are placed in
+	`multiprocessing.shared_memory` so workers read them and write the result
+	without copying, while generic element types are pickled once per worker
+	through the pool initializer.
+	
+	Args:
+		a, b (Matrix) -- Factors of the product
+		workers (int) -- Number of processes (default `os.cpu_count()`)
+		block (int) -- Tile size (default splits the rows evenly between the workers)
+	
+	Returns:
+		Matrix -- the product `a * b`
+	"""
+	
+	n, k = a.shape
+	kb, m = b.shape
+	if k != kb:
+		raise ValueError(f"Matrix Row-Column mismatch between {k} and {kb}")
+	
+	workers = workers or os.cpu_count() or 1
+	if workers == 1:
+		return a * b
+	if block is None:
+		block = max(1, -(-n // (2 * workers)))
+	
+	isfloat = all(matrix._isnumeric(x for row in mat.rows for x in row) if mat.array is None
+		else mat.array.dtype.kind == 'f' for mat in (a, b))
+	if isfloat:
+		return _sharedMultiply(a, b, (n, k, m), workers, block)
+	
+	cols = list(zip(*b.rows))
+	out = [[None] * m for _ in range(n)]
+	with ProcessPoolExecutor(workers, initializer=_initGeneric, initargs=(a.rows, cols)) as pool:
+		futures = [pool.submit(_genericTile, *tile) for tile in _tiles(n, m, block)]
+		for fut in futures:
+			r0, c0, tile = fut.result()
+			for r, row in enumerate(tile, r0):
+				out[r][c0:c0 + len(row)] = row
+	return matrix.Matrix(*out)
+
+def _sharedMultiply(a, b, shape, workers, block):
+	n, k, m = shape
+	blocks = [shared_memory.SharedMemory(create=True, size=8 * size) for size in (n * k, m * k, n * m)]
+	try:
+		if np is not None:
+			np.ndarray((n, k), dtype=np.float64, buffer=blocks[0].buf)[:] = a.array if a.array is not None else a.rows
+			np.ndarray((m, k), dtype=np.float64, buffer=blocks[1].buf)[:] = (b.array if b.array is not None else np.array(b.rows, dtype=np.float64)).T
+		else:
+			blocks[0].buf.cast('d')[:] = array('d', (x for row in a.rows for x in row))
+			blocks[1].buf.cast('d')[:] = array('d', (x for col in zip(*b.rows) for x in col))
+		
+		names = [blk.name for blk in blocks]
+		with ProcessPoolExecutor(workers, initializer=_initShared, initargs=(names, shape)) as pool:
+			for fut in [pool.submit(_sharedTile, *tile) for tile in _tiles(n, m, block)]:
+				fut.result()
+		
+		if np is not None:
+			return matrix.Matrix.fromArray(np.ndarray((n, m), dtype=np.float64, buffer=blocks[2].buf).copy())
+		
+		flat = blocks[2].buf.cast('d').tolist()
+		return matrix.Matrix(*(flat[r * m:(r + 1) * m] for r in range(n)))
+	finally:
+		for blk in blocks:
+			blk.close()
+			blk.unlink()
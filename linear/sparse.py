@@ -0,0 +1,455 @@
+from math import sqrt
+from array import array
+import operator
+
+from . import vector
+from . import matrix
+
+class SparseMatrix:
+	"""
+	Sparse Matrix stored in Compressed Sparse Row (CSR) format.
+	Row `r` has its column indices in `indices[indptr[r]:indptr[r + 1]]` (sorted)
+	and the matching values at the same positions of `data`.
+	Indices live in `array('q')` buffers and values in an `array('d')` when they
+	are all floats or a list for other element types.
+	"""
+	
+	def __init__(self, shape, rows=(), cols=(), vals=(), zeroVal=0):
+		"""
+		Build from coordinate (COO) triplets summing duplicate entries
+		and dropping those equal to `zeroVal`
+		"""
+		
+		rs, cs = shape
+		if rs <= 0 or cs <= 0:
+			raise ValueError(f"Sparse Matrix must have positive shape not {shape}")
+		self.shape = (rs, cs)
+		
+		entries = {}
+		for r, c, v in zip(rows, cols, vals):
+			if r < 0 or rs <= r or c < 0 or cs <= c:
+				raise IndexError(f"Sparse Matrix index ({r}, {c}) out of bounds for shape {shape}")
+			
+			key = (r, c)
+			entries[key] = entries[key] + v if key in entries else v
+		
+		keys = sorted(k for k, v in entries.items() if v != zeroVal)
+		counts = [0] * (rs + 1)
+		for r, _ in keys:
+			counts[r + 1] += 1
+		for r in range(rs):
+			counts[r + 1] += counts[r]
+		
+		self.indptr = array('q', counts)
+		self.indices = array('q', (c for _, c in keys))
+		self.data = vector._buffer(entries[k] for k in keys)
+		self._transpose = None
+	
+	@staticmethod
+	def _fromCSR(shape, indptr, indices, data):
+		mat = SparseMatrix.__new__(SparseMatrix)
+		mat.shape = shape
+		mat.indptr = array('q', indptr)
+		mat.indices = array('q', indices)
+		mat.data = vector._buffer(data)
+		mat._transpose = None
+		return mat
+	
+	@staticmethod
+	def fromDense(mat, zeroVal=0):
+		rs, cs = mat.shape
+		coords = [(r, c, mat.rows[r][c]) for r in range(rs) for c in range(cs) if mat.rows[r][c] != zeroVal]
+		return SparseMatrix((rs, cs), *zip(*coords), zeroVal=zeroVal) if coords else SparseMatrix((rs, cs))
+	
+	def toDense(self, zeroVal=0):
+		rs, cs = self.shape
+		rows = [[zeroVal] * cs for _ in range(rs)]
+		for r in range(rs):
+			for k in range(self.indptr[r], self.indptr[r + 1]):
+				rows[r][self.indices[k]] = self.data[k]
+		return matrix.Matrix(*rows)
+	
+	def coo(self):
+		""" Return the (rows, cols, vals) triplets of the stored entries """
+		rows = [r for r in range(self.shape[0]) for _ in range(self.indptr[r], self.indptr[r + 1])]
+		return rows, list(self.indices), list(self.data)
+	
+	def csc(self):
+		""" Return the Compressed Sparse Column arrays (indptr, indices, data) """
+		tr = self.transpose()
+		return tr.indptr, tr.indices, tr.data
+	
+	
+	
+	@property
+	def nnz(self):
+		return len(self.data)
+	
+	def __getitem__(self, key):
+		r, c = key
+		lo, hi = self.indptr[r], self.indptr[r + 1]
+		while lo < hi:
+			mid = (lo + hi) // 2
+			if self.indices[mid] < c:
+				lo = mid + 1
+			else:
+				hi = mid
+		
+		if lo < self.indptr[r + 1] and self.indices[lo] == c:
+			return self.data[lo]
+		return 0
+	
+	def diagonal(self):
+		return [self[i, i] for i in range(min(self.shape))]
+	
+	def __eq__(self, other):
+		if not isinstance(other, SparseMatrix):
+			return False
+		return self.shape == other.shape and self.indptr == other.indptr \
+			and self.indices == other.indices and list(self.data) == list(other.data)
+	
+	def __neq__(self, other):
+		return not self.__eq__(other)
+	
+	def __repr__(self):
+		return f"SparseMatrix({self.shape}, nnz={self.nnz})"
+	
+	
+	
+	def transpose(self):
+		""" Transpose in O(nnz) using a counting sort on the column indices """
+		if self._transpose is not None:
+			return self._transpose
+		
+		rs, cs = self.shape
+		counts = [0] * (cs + 1)
+		for c in self.indices:
+			counts[c + 1] += 1
+		for c in range(cs):
+			counts[c + 1] += counts[c]
+		
+		nxt = counts[:-1]
+		indices, data = [0] * self.nnz, [None] * self.nnz
+		for r in range(rs):
+			for k in range(self.indptr[r], self.indptr[r + 1]):
+				c = self.indices[k]
+				indices[nxt[c]] = r
+				data[nxt[c]] = self.data[k]
+				nxt[c] += 1
+		
+		self._transpose = SparseMatrix._fromCSR((cs, rs), counts, indices, data)
+		self._transpose._transpose = self
+		return self._transpose
+	
+	def _combine(self, other, op, zeroVal=0):
+		""" Merge the rows of two Sparse Matrices applying `op` entrywise """
+		if not isinstance(other, SparseMatrix):
+			raise TypeError("Sparse Matrix can only be added to another Sparse Matrix")
+		elif self.shape != other.shape:
+			raise ValueError(f"Sparse Matrix shape mismatch between {self.shape} and {other.shape}")
+		
+		indptr, indices, data = [0], [], []
+		for r in range(self.shape[0]):
+			i, iend = self.indptr[r], self.indptr[r + 1]
+			j, jend = other.indptr[r], other.indptr[r + 1]
+			while i < iend or j < jend:
+				ci = self.indices[i] if i < iend else None
+				cj = other.indices[j] if j < jend else None
+				if cj is None or (ci is not None and ci < cj):
+					c, v = ci, op(self.data[i], zeroVal)
+					i += 1
+				elif ci is None or cj < ci:
+					c, v = cj, op(zeroVal, other.data[j])
+					j += 1
+				else:
+					c, v = ci, op(self.data[i], other.data[j])
+					i += 1
+					j += 1
+				
+				if v != zeroVal:
+					indices.append(c)
+					data.append(v)
+			indptr.append(len(indices))
+		
+		return SparseMatrix._fromCSR(self.shape, indptr, indices, data)
+	
+	def __add__(self, other):
+		return self._combine(other, operator.add)
+	
+	def __sub__(self, other):
+		return self._combine(other, operator.sub)
+	
+	def __neg__(self):
+		return SparseMatrix._fromCSR(self.shape, self.indptr, self.indices, [-v for v in self.data])
+	
+	
+	
+	def _matvec(self, x):
+		""" Multiply by the list `x` returning a list """
+		ind, data, ptr = self.indices, self.data, self.indptr
+		return [sum(map(operator.mul, data[ptr[r]:ptr[r + 1]], [x[c] for c in ind[ptr[r]:ptr[r + 1]]]))
+			for r in range(self.shape[0])]
+	
+	def __mul__(self, other):
+		if isinstance(other, vector.Vector):
+			if len(other) != self.shape[1]:
+				raise ValueError(f"Sparse Matrix Column mismatch with Vector between {self.shape[1]} and {len(other)}")
+			return vector.Vector(*self._matvec(other.components))
+		elif isinstance(other, (SparseMatrix, matrix.Matrix)):
+			raise TypeError("Sparse Matrix can only be multiplied by Vectors and scalars")
+		else:
+			return SparseMatrix._fromCSR(self.shape, self.indptr, self.indices, [other * v for v in self.data])
+	
+	def __rmul__(self, other):
+		return self.__mul__(other)
+	
+	def __matmul__(self, other):
+		return self.__mul__(other)
+
+
+
+class Jacobi:
+	""" Jacobi (diagonal) preconditioner applying the inverse of the diagonal """
+	
+	def __init__(self, mat):
+		diag = mat.diagonal()
+		if any(d == 0 for d in diag):
+			raise ZeroDivisionError("Jacobi preconditioner requires a nonzero diagonal")
+		self.invDiag = [1 / d for d in diag]
+	
+	def __call__(self, r):
+		return list(map(operator.mul, self.invDiag, r))
+
+class ILU0:
+	"""
+	Incomplete LU factorization with zero fill-in
+	L (unit lower) and U share the sparsity pattern of the square Matrix in one CSR buffer
+	"""
+	
+	def __init__(self, mat):
+		n, cs = mat.shape
+		if n != cs:
+			raise ValueError("ILU(0) can only be calculated for Square Matrices")
+		
+		self.size = n
+		self.indptr, self.indices = mat.indptr, mat.indices
+		self.data = data = [float(v) for v in mat.data]
+		
+		ptr, ind = self.indptr, self.indices
+		self.diag = diag = [None] * n
+		for i in range(n):
+			for k in range(ptr[i], ptr[i + 1]):
+				if ind[k] == i:
+					diag[i] = k
+			if diag[i] is None:
+				raise ZeroDivisionError(f"ILU(0) requires a stored diagonal entry in row {i}")
+		
+		for i in range(1, n):
+			pos = {ind[k]: k for k in range(ptr[i], ptr[i + 1])}
+			for kk in range(ptr[i], diag[i]):
+				k = ind[kk]
+				pivot = data[diag[k]]
+				if pivot == 0:
+					raise ZeroDivisionError(f"ILU(0) encountered a zero pivot in row {k}")
+				
+				fac = data[kk] = data[kk] / pivot
+				if fac == 0:
+					continue
+				
+				for jj in range(diag[k] + 1, ptr[k + 1]):
+					target = pos.get(ind[jj])
+					if target is not None:
+						data[target] -= fac * data[jj]
+	
+	def __call__(self, r):
+		n, ptr, ind, data, diag = self.size, self.indptr, self.indices, self.data, self.diag
+		y = list(r)
+		for i in range(n):
+			for k in range(ptr[i], diag[i]):
+				y[i] -= data[k] * y[ind[k]]
+		
+		for i in range(n - 1, -1, -1):
+			for k in range(diag[i] + 1, ptr[i + 1]):
+				y[i] -= data[k] * y[ind[k]]
+			y[i] /= data[diag[i]]
+		return y
+
+
+
+def _dot(x, y):
+	return sum(map(operator.mul, x, y))
+
+def _start(mat, b, x0):
+	""" Right-hand side, initial guess and residual as lists along with the norm of `b` """
+	n = mat.shape[0]
+	if mat.shape[1] != n:
+		raise ValueError("Iterative solvers require a Square Sparse Matrix")
+	
+	b = [float(v) for v in (b.components if isinstance(b, vector.Vector) else b)]
+	if len(b) != n:
+		raise ValueError(f"Dimension mismatch between Sparse Matrix {n} and Vector {len(b)}")
+	
+	x = [0.0] * n if x0 is None else [float(v) for v in (x0.components if isinstance(x0, vector.Vector) else x0)]
+	r = list(map(operator.sub, b, mat._matvec(x))) if x0 is not None else b[:]
+	return b, x, r, sqrt(_dot(b, b)) or 1.0
+
+def _identity(r):
+	return r
+
+def cg(mat, b, x0=None, tol=1e-10, maxiter=None, precond=None):
+	"""
+	Preconditioned Conjugate Gradient for symmetric positive definite Sparse Matrices
+	
+	Args:
+		mat (SparseMatrix) -- System matrix
+		b (Vector) -- Right-hand side
+		x0 (Vector) -- Initial guess (default zero)
+		tol (float) -- Stop once the residual norm is at most `tol` times the norm of `b`
+		maxiter (int) -- Iteration limit (default 10 times the dimension)
+		precond (callable) -- Applies the preconditioner inverse to a list e.g. `Jacobi(mat)`
+	
+	Returns:
+		Vector -- approximate solution
+	"""
+	
+	b, x, r, bnorm = _start(mat, b, x0)
+	precond = precond or _identity
+	maxiter = 10 * len(x) if maxiter is None else maxiter
+	
+	z = precond(r)
+	p = z[:]
+	rz = _dot(r, z)
+	for _ in range(maxiter):
+		if sqrt(_dot(r, r)) <= tol * bnorm:
+			return vector.Vector(*x)
+		
+		Ap = mat._matvec(p)
+		pAp = _dot(p, Ap)
+		if pAp == 0:
+			raise ArithmeticError("Conjugate Gradient broke down, Matrix may not be positive definite")
+		
+		alpha = rz / pAp
+		x = [xi + alpha * pi for xi, pi in zip(x, p)]
+		r = [ri - alpha * api for ri, api in zip(r, Ap)]
+		
+		z = precond(r)
+		rzNew = _dot(r, z)
+		beta = rzNew / rz
+		p = [zi + beta * pi for zi, pi in zip(z, p)]
+		rz = rzNew
+	
+	if sqrt(_dot(r, r)) <= tol * bnorm:
+		return vector.Vector(*x)
+	raise ArithmeticError(f"Conjugate Gradient did not converge within {maxiter} iterations")
+
+def bicgstab(mat, b, x0=None, tol=1e-10, maxiter=None, precond=None):
+	"""
+	Right preconditioned BiCGSTAB for general square Sparse Matrices
+	Arguments match `cg`
+	"""
+	
+	b, x, r, bnorm = _start(mat, b, x0)
+	precond = precond or _identity
+	maxiter = 10 * len(x) if maxiter is None else maxiter
+	
+	rhat = r[:]
+	rho = alpha = omega = 1.0
+	v = p = [0.0] * len(x)
+	for _ in range(maxiter):
+		if sqrt(_dot(r, r)) <= tol * bnorm:
+			return vector.Vector(*x)
+		
+		rhoNew = _dot(rhat, r)
+		if rhoNew == 0 or omega == 0:
+			raise ArithmeticError("BiCGSTAB broke down")
+		
+		beta = (rhoNew / rho) * (alpha / omega)
+		rho = rhoNew
+		p = [ri + beta * (pi - omega * vi) for ri, pi, vi in zip(r, p, v)]
+		
+		phat = precond(p)
+		v = mat._matvec(phat)
+		alpha = rho / _dot(rhat, v)
+		s = [ri - alpha * vi for ri, vi in zip(r, v)]
+		
+		if sqrt(_dot(s, s)) <= tol * bnorm:
+			x = [xi + alpha * pi for xi, pi in zip(x, phat)]
+			return vector.Vector(*x)
+		
+		shat = precond(s)
+		t = mat._matvec(shat)
+		tt = _dot(t, t)
+		omega = _dot(t, s) / tt if tt != 0 else 0.0
+		
+		x = [xi + alpha * pi + omega * si for xi, pi, si in zip(x, phat, shat)]
+		r = [si - omega * ti for si, ti in zip(s, t)]
+	
+	if sqrt(_dot(r, r)) <= tol * bnorm:
+		return vector.Vector(*x)
+	raise ArithmeticError(f"BiCGSTAB did not converge within {maxiter} iterations")
+
+def gmres(mat, b, x0=None, tol=1e-10, maxiter=None, precond=None, restart=30):
+	"""
+	Restarted right preconditioned GMRES using Givens rotations
+	Arguments match `cg` with `restart` giving the Krylov subspace size
+	and `maxiter` counting inner iterations
+	"""
+	
+	b, x, r, bnorm = _start(mat, b, x0)
+	precond = precond or _identity
+	n = len(x)
+	maxiter = 10 * n if maxiter is None else maxiter
+	restart = min(restart, n)
+	
+	iters = 0
+	while iters < maxiter:
+		beta = sqrt(_dot(r, r))
+		if beta <= tol * bnorm:
+			return vector.Vector(*x)
+		
+		V = [[ri / beta for ri in r]]
+		Z, H, cs, sn = [], [], [], []
+		g = [beta]
+		for j in range(restart):
+			iters += 1
+			z = precond(V[j])
+			w = mat._matvec(z)
+			Z.append(z)
+			
+			# Modified Gram-Schmidt Arnoldi step
+			h = []
+			for vi in V:
+				hij = _dot(w, vi)
+				w = [wk - hij * vk for wk, vk in zip(w, vi)]
+				h.append(hij)
+			hnext = sqrt(_dot(w, w))
+			
+			# Apply the previous rotations then form a new one
+			for i in range(j):
+				h[i], h[i + 1] = cs[i] * h[i] + sn[i] * h[i + 1], -sn[i] * h[i] + cs[i] * h[i + 1]
+			denom = sqrt(h[j] * h[j] + hnext * hnext)
+			c, s = (1.0, 0.0) if denom == 0 else (h[j] / denom, hnext / denom)
+			cs.append(c)
+			sn.append(s)
+			h[j] = denom
+			g.append(-s * g[j])
+			g[j] *= c
+			H.append(h)
+			
+			if abs(g[j + 1]) <= tol * bnorm or hnext == 0 or iters >= maxiter:
+				break
+			V.append([wk / hnext for wk in w])
+		
+		# Back substitution on the triangular least squares system
+		k = len(H)
+		y = [0.0] * k
+		for i in range(k - 1, -1, -1):
+			y[i] = (g[i] - sum(H[m][i] * y[m] for m in range(i + 1, k))) / H[i][i]
+		for i in range(k):
+			x = [xk + y[i] * zk for xk, zk in zip(x, Z[i])]
+		
+		r = list(map(operator.sub, b, mat._matvec(x)))
+	
+	if sqrt(_dot(r, r)) <= tol * bnorm:
+		return vector.Vector(*x)
+	raise ArithmeticError(f"GMRES did not converge within {maxiter} iterations")
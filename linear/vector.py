@@ -1,4 +1,8 @@
-from math import sqrt, sin, cos
+from math import sqrt, sin, cos, copysign
+from sys import float_info
+from array import array
+from itertools import repeat
+import operator
 
 class Vector:
 	def __init__(self, *comps):
@@ -124,19 +128,198 @@ class Vector:
 
 
 
-def gramschmidt(*vectors):
-	basis, first = [], True
+def gramschmidt(*vectors, tol=None):
+	"""
+	Orthogonalize `vectors` using Modified Gram-Schmidt,
+	dropping vectors which depend on the earlier ones
+	
+	Args:
+		vectors (Vector) -- Vectors to orthogonalize
+		tol (float) -- Relative tolerance for deciding dependence (see `modgramschmidt`)
+	
+	Returns:
+		list of Vector -- orthogonal (not normalized) basis
+	"""
+	
+	if len(vectors) == 0:
+		return []
+	
+	dims = len(vectors[0])
+	buf = []
 	for v in vectors:
-		if first:
-			basis.append(v)
-		else:
-			for b in basis:
-				v -= (v * b) / (b * b) * b
+		if len(v) != dims:
+			raise ValueError(f"Vector dimensions do not match: {dims} and {len(v)}")
+		buf.extend(v.components)
+	
+	rank = modgramschmidt(buf, dims, tol=tol, normalize=False)
+	return [Vector(*buf[i * dims:(i + 1) * dims]) for i in range(rank)]
+
+
+
+def _isfloat(buf):
+	return (isinstance(buf, array) and buf.typecode in 'fd') or any(type(c) is float for c in buf)
+
+def _tolerance(buf, dims, tol, isfloat=None):
+	"""
+	Absolute threshold below which a vector's magnitude counts as zero
+	Exact element types default to a tolerance of zero unless `isfloat` says
+	the computation happens in floats regardless
+	"""
+	
+	if tol is None:
+		if not (_isfloat(buf) if isfloat is None else isfloat):
+			return 0
+		tol = max(len(buf) // dims, dims) * float_info.epsilon
+	
+	maxSq = max((sum(c * c for c in buf[i:i + dims]) for i in range(0, len(buf), dims)), default=0)
+	return tol * sqrt(maxSq)
+
+def _store(buf, start, vals):
+	""" Overwrite `buf[start:start + len(vals)]` preserving the buffer type """
+	vals = array(buf.typecode, vals) if isinstance(buf, array) else list(vals)
+	buf[start:start + len(vals)] = vals
+
+def modgramschmidt(buf, dims, tol=None, normalize=True):
+	"""
+	Orthogonalize the vectors stored row-major in the flat buffer `buf` in place
+	using Modified Gram-Schmidt with reorthogonalization for floats.
+	The independent vectors are packed at the front of `buf`.
+	
+	Args:
+		buf (list or array) -- Components of the vectors one after another
+		dims (int) -- Dimension of each vector
+		tol (float) -- A vector is dependent when its residual is at most `tol` times
+			the largest input magnitude. Defaults to `max(n, dims) * epsilon` for floats
+			and exact comparison with zero otherwise
+		normalize (bool) -- Whether to scale basis vectors to unit length
+	
+	Returns:
+		int -- rank, the number of basis vectors at the front of `buf`
+	"""
+	
+	n = len(buf) // dims
+	tolAbs = _tolerance(buf, dims, tol)
+	isfloat = _isfloat(buf)
+	
+	rank, sqNorms = 0, []
+	for i in range(n):
+		v = list(buf[i * dims:(i + 1) * dims])
+		origSq = sum(map(operator.mul, v, v))
+		
+		# Floats get a second pass when cancellation lost more than half the magnitude
+		for _ in range(2 if isfloat else 1):
+			for k in range(rank):
+				b = buf[k * dims:(k + 1) * dims]
+				fac = sum(map(operator.mul, v, b))
+				if not normalize:
+					fac = fac / sqNorms[k]
+				
+				if fac != 0:
+					v = list(map(operator.sub, v, [fac * c for c in b]))
 			
-			if not v.iszero():
-				basis.append(v)
+			sq = sum(map(operator.mul, v, v))
+			if not isfloat or 2 * sq > origSq:
+				break
+			origSq = sq
+		
+		if (sq == 0) if tolAbs == 0 else (sq <= tolAbs * tolAbs):
+			continue
+		
+		if normalize:
+			inv = 1 / sqrt(sq)
+			v = [c * inv for c in v]
+		else:
+			sqNorms.append(sq)
+		
+		_store(buf, rank * dims, v)
+		rank += 1
+	
+	return rank
+
+def householder(buf, dims, tol=None):
+	"""
+	Householder QR factorization with column pivoting of the matrix whose
+	columns are the vectors stored row-major in the flat buffer `buf`.
+	Works in place, leaving R in the upper triangle and the essential part of
+	each reflector below the diagonal (LAPACK style with implicit leading 1).
+	Entry (i, j) of the factored matrix is `buf[j * dims + i]`.
+	
+	Args:
+		buf (list or array) -- Components of the vectors one after another
+		dims (int) -- Dimension of each vector
+		tol (float) -- Stop once the largest remaining column is at most `tol`
+			times the largest input magnitude. Defaults to `max(n, dims) * epsilon`
+			for every element type as the reflectors are always computed in floats
+	
+	Returns:
+		tuple -- (taus, perm, rank) where `taus` are the reflector scales
+			and `perm[j]` is the original index of the j-th pivoted vector
+	"""
 	
-	return basis
+	n = len(buf) // dims
+	tolAbs = _tolerance(buf, dims, tol, isfloat=True)
+	perm, taus = list(range(n)), []
+	
+	for k in range(min(n, dims)):
+		# Pivot on remaining column with the largest trailing norm
+		best, bestSq = k, -1
+		for j in range(k, n):
+			sq = sum(c * c for c in buf[j * dims + k:(j + 1) * dims])
+			if sq > bestSq:
+				best, bestSq = j, sq
+		
+		if bestSq <= tolAbs * tolAbs:
+			break
+		
+		if best != k:
+			colK = buf[k * dims:(k + 1) * dims]
+			buf[k * dims:(k + 1) * dims] = buf[best * dims:(best + 1) * dims]
+			buf[best * dims:(best + 1) * dims] = colK
+			perm[k], perm[best] = perm[best], perm[k]
+		
+		start = k * dims + k
+		x0 = buf[start]
+		alpha = -copysign(sqrt(bestSq), x0)
+		v0 = x0 - alpha
+		ess = [c / v0 for c in buf[start + 1:(k + 1) * dims]]
+		tau = (alpha - x0) / alpha
+		
+		buf[start] = alpha
+		_store(buf, start + 1, ess)
+		taus.append(tau)
+		
+		# Apply reflector I - tau * u * u^T with u = (1, ess) to the remaining columns
+		for j in range(k + 1, n):
+			cs = j * dims + k
+			y = buf[cs:(j + 1) * dims]
+			fac = tau * (y[0] + sum(map(operator.mul, ess, y[1:])))
+			if fac != 0:
+				buf[cs] = y[0] - fac
+				_store(buf, cs + 1, map(operator.sub, y[1:], [fac * c for c in ess]))
+	
+	return taus, perm, len(taus)
+
+def householderbasis(buf, dims, taus):
+	"""
+	Form the orthonormal columns of Q from reflectors left in `buf` by `householder`
+	
+	Returns:
+		list -- flat row-major buffer holding `len(taus)` orthonormal vectors
+	"""
+	
+	rank = len(taus)
+	qbuf = [0.0] * (rank * dims)
+	for k in range(rank):
+		q = [0.0] * dims
+		q[k] = 1.0
+		for i in range(k, -1, -1):
+			ess = buf[i * dims + i + 1:(i + 1) * dims]
+			fac = taus[i] * (q[i] + sum(map(operator.mul, ess, q[i + 1:])))
+			if fac != 0:
+				q[i] -= fac
+				q[i + 1:] = map(operator.sub, q[i + 1:], [fac * c for c in ess])
+		qbuf[k * dims:(k + 1) * dims] = q
+	return qbuf
 
 
 
@@ -160,3 +343,250 @@ def cross(vec1, vec2):
 		return Vector(x, y, z)
 	else:
 		raise ValueError(f"Cross Product not defined on Vectors of dimension {dim1}")
+
+
+
+
+def _buffer(comps):
+	""" Store components in a flat `array('d')` when they are all floats, otherwise in a list """
+	comps = list(comps)
+	if len(comps) > 0 and all(type(c) is float for c in comps):
+		return array('d', comps)
+	return comps
+
+def _dot(cols1, cols2):
+	""" Sum the elementwise products of two lists of column iterables """
+	total = None
+	for c1, c2 in zip(cols1, cols2):
+		prods = list(map(operator.mul, c1, c2))
+		total = prods if total is None else list(map(operator.add, total, prods))
+	return total
+
+class VectorBatch:
+	"""
+	Collection of `n` Vectors of dimension `dims` whose components are
+	stored contiguously in a single flat row-major buffer.
+	The i-th component of every vector is the strided slice `data[i::dims]`
+	so each operation works column by column instead of vector by vector.
+	"""
+	
+	def __init__(self, dims, comps=()):
+		if dims <= 0:
+			raise ValueError(f"VectorBatch dimension must be positive not {dims}")
+		
+		self.dims = dims
+		self.data = _buffer(comps)
+		if len(self.data) % dims != 0:
+			raise ValueError(f"Number of components {len(self.data)} is not a multiple of dimension {dims}")
+	
+	@staticmethod
+	def fromVectors(vectors, dims=None):
+		vectors = list(vectors)
+		if dims is None:
+			if len(vectors) == 0:
+				raise ValueError("Dimension must be given for an empty VectorBatch")
+			dims = len(vectors[0])
+		
+		comps = []
+		for v in vectors:
+			if len(v) != dims:
+				raise ValueError(f"Vector dimensions do not match: {dims} and {len(v)}")
+			comps.extend(v.components)
+		return VectorBatch(dims, comps)
+	
+	@staticmethod
+	def fromColumns(*cols):
+		cols = list(map(list, cols))
+		n = len(cols[0])
+		for col in cols:
+			if len(col) != n:
+				raise ValueError(f"Column lengths do not match: {n} and {len(col)}")
+		
+		comps = [None] * (n * len(cols))
+		for i, col in enumerate(cols):
+			comps[i::len(cols)] = col
+		return VectorBatch(len(cols), comps)
+	
+	def toVectors(self):
+		return [self[i] for i in range(len(self))]
+	
+	
+	
+	def __len__(self):
+		return len(self.data) // self.dims
+	
+	def __getitem__(self, key):
+		d = self.dims
+		if key < 0:
+			key += len(self)
+		if key < 0 or len(self) <= key:
+			raise IndexError(f"VectorBatch index out of bounds {key}")
+		return Vector(*self.data[key * d:(key + 1) * d])
+	
+	def __iter__(self):
+		return iter(self.toVectors())
+	
+	def __eq__(self, other):
+		if not isinstance(other, VectorBatch):
+			return False
+		return self.dims == other.dims and list(self.data) == list(other.data)
+	
+	def __neq__(self, other):
+		return not self.__eq__(other)
+	
+	def __repr__(self):
+		return 'VectorBatch(' + ', '.join(map(repr, self.toVectors())) + ')'
+	
+	
+	
+	def column(self, i):
+		""" Return the `i`-th component of every vector """
+		return self.data[i::self.dims]
+	
+	def columns(self):
+		return [self.column(i) for i in range(self.dims)]
+	
+	def _otherColumns(self, other):
+		""" Get columns of `other` broadcasting a single Vector across the batch """
+		if isinstance(other, VectorBatch):
+			if other.dims != self.dims:
+				raise ValueError(f"Vector dimensions do not match: {self.dims} and {other.dims}")
+			elif len(other) != len(self):
+				raise ValueError(f"VectorBatch lengths do not match: {len(self)} and {len(other)}")
+			return other.columns()
+		elif isinstance(other, Vector):
+			if len(other) != self.dims:
+				raise ValueError(f"Vector dimensions do not match: {self.dims} and {len(other)}")
+			return [repeat(c, len(self)) for c in other.components]
+		else:
+			raise TypeError("VectorBatch operations are only defined with Vectors or VectorBatches")
+	
+	
+	
+	def __add__(self, other):
+		cols = self._otherColumns(other)
+		return VectorBatch.fromColumns(*map(lambda c1, c2: map(operator.add, c1, c2), self.columns(), cols))
+	
+	def __sub__(self, other):
+		cols = self._otherColumns(other)
+		return VectorBatch.fromColumns(*map(lambda c1, c2: map(operator.sub, c1, c2), self.columns(), cols))
+	
+	def scale(self, factors):
+		""" Multiply each vector by a scalar or by the corresponding entry of `factors` """
+		try:
+			factors = list(factors)
+		except TypeError:
+			return VectorBatch(self.dims, [factors * c for c in self.data])
+		
+		if len(factors) != len(self):
+			raise ValueError(f"Number of factors {len(factors)} does not match VectorBatch length {len(self)}")
+		return VectorBatch.fromColumns(*(map(operator.mul, factors, col) for col in self.columns()))
+	
+	def dot(self, other):
+		""" Return the list of dot products of each vector with `other` """
+		if len(self) == 0:
+			return []
+		return _dot(self.columns(), self._otherColumns(other))
+	
+	def cross(self, other):
+		"""
+		Cross each vector with `other`
+		Returns a list of scalars for 2 dimensional vectors and a VectorBatch for 3 dimensional ones
+		"""
+		cols = self._otherColumns(other)
+		if self.dims == 2:
+			(x1, y1), (x2, y2) = self.columns(), cols
+			return list(map(operator.sub, map(operator.mul, x1, y2), map(operator.mul, y1, x2)))
+		elif self.dims == 3:
+			(x1, y1, z1), (x2, y2, z2) = self.columns(), map(list, cols)
+			return VectorBatch.fromColumns(
+				map(operator.sub, map(operator.mul, y1, z2), map(operator.mul, z1, y2)),
+				map(operator.sub, map(operator.mul, z1, x2), map(operator.mul, x1, z2)),
+				map(operator.sub, map(operator.mul, x1, y2), map(operator.mul, y1, x2))
+			)
+		else:
+			raise ValueError(f"Cross Product not defined on Vectors of dimension {self.dims}")
+	
+	def norms(self):
+		""" Return the list of magnitudes of each vector """
+		if len(self) == 0:
+			return []
+		return list(map(sqrt, _dot(self.columns(), self.columns())))
+	
+	def normalize(self):
+		""" Scale every vector to unit length """
+		return self.scale([1 / n for n in self.norms()])
+	
+	def rotate(self, rotand, angle):
+		"""
+		Rotate `rotand` about the rotators defined by `self`
+		by an angle of `angle` counterclockwise.
+		Note: Uses Rodriguez Rotation Formula
+		
+		Args:
+			rotand (Vector or VectorBatch) -- Vectors to rotate around self
+			angle (float or list of floats) -- angles by which to rotate in radians
+		
+		Returns:
+			VectorBatch -- rotated vectors
+		"""
+		
+		n = len(self)
+		if self.dims != 3:
+			raise ValueError(f"Rotation is only defined on Vectors of dimension 3 not {self.dims}")
+		
+		try:
+			angle = list(angle)
+		except TypeError:
+			angle = [angle] * n
+		if len(angle) != n:
+			raise ValueError(f"Number of angles {len(angle)} does not match VectorBatch length {n}")
+		cs, ss = list(map(cos, angle)), list(map(sin, angle))
+		
+		if isinstance(rotand, Vector):
+			rotand = VectorBatch.fromColumns(*(list(c) for c in self._otherColumns(rotand)))
+		
+		sqMags = _dot(self.columns(), self.columns())
+		crossFacs = list(map(operator.truediv, ss, map(sqrt, sqMags)))
+		projFacs = map(operator.truediv, (1 - c for c in cs), sqMags)
+		projFacs = list(map(operator.mul, self.dot(rotand), projFacs))
+		
+		total = rotand.scale(cs)
+		total += self.cross(rotand).scale(crossFacs)
+		total += self.scale(projFacs)
+		return total
+	
+	def gramschmidt(self, tol=None):
+		""" Orthogonalize the vectors of the batch, dropping those which are dependent """
+		buf = self._copy()
+		rank = modgramschmidt(buf, self.dims, tol=tol, normalize=False)
+		return VectorBatch(self.dims, buf[:rank * self.dims])
+	
+	def orthonormalize(self, tol=None):
+		""" Orthonormal basis for the span of the batch using Modified Gram-Schmidt """
+		buf = self._copy()
+		rank = modgramschmidt(buf, self.dims, tol=tol)
+		return VectorBatch(self.dims, buf[:rank * self.dims])
+	
+	def rank(self, tol=None):
+		return householder(self._copy(), self.dims, tol=tol)[2]
+	
+	def qr(self, tol=None):
+		"""
+		Householder QR with column pivoting of the matrix whose columns are the batch vectors
+		
+		Returns:
+			tuple -- (Q, R, perm) where Q is a VectorBatch of `rank` orthonormal vectors,
+				R is a list of `rank` rows of length `len(self)` and the pivoted vectors
+				satisfy `self[perm[j]] == sum(R[i][j] * Q[i] for i in range(rank))`
+		"""
+		
+		d, n = self.dims, len(self)
+		buf = self._copy()
+		taus, perm, rank = householder(buf, d, tol=tol)
+		
+		R = [[buf[j * d + i] if i <= j else 0.0 for j in range(n)] for i in range(rank)]
+		return VectorBatch(d, householderbasis(buf, d, taus)), R, perm
+	
+	def _copy(self):
+		return self.data[:] if isinstance(self.data, array) else list(self.data)